@@ -0,0 +1 @@
+# Benchmarks for Terminus Veil: Below the Surface
@@ -0,0 +1,38 @@
+"""Benchmark dungeon generators across map sizes.
+
+    python -m benchmarks.bench_dungeon
+"""
+
+import random
+import time
+
+from game import dungeon_generator
+from game.dungeon_generator import DungeonGenerator
+
+SIZES = [(80, 40), (400, 200), (1000, 1000), (2000, 2000)]
+
+
+def time_generator(width: int, height: int, algorithm: str) -> float:
+    generator = DungeonGenerator(width, height, random.Random(1234))
+    start = time.perf_counter()
+    generator.generate(algorithm)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    numpy = dungeon_generator.np
+    time_generator(32, 32, 'cave')   # warm up NumPy
+    print(f"{'map':>10} {'bsp ms':>10} {'cave ms':>10} {'cave (no numpy) ms':>19}")
+    for width, height in SIZES:
+        bsp = time_generator(width, height, 'bsp')
+        cave = time_generator(width, height, 'cave') if numpy is not None else float('nan')
+        dungeon_generator.np = None
+        try:
+            python_cave = time_generator(width, height, 'cave') if width * height <= 10 ** 6 else float('nan')
+        finally:
+            dungeon_generator.np = numpy
+        print(f"{width}x{height:<5} {bsp:>10.1f} {cave:>10.1f} {python_cave:>19.1f}")
+
+
+if __name__ == "__main__":
+    main()
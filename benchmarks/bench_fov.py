@@ -0,0 +1,45 @@
+"""Benchmark FOV algorithms on generated maps.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_fov
+"""
+
+import random
+import time
+
+from game.dungeon_generator import DungeonGenerator
+from game.fov import FOVCalculator
+from game.tiles import TileGrid
+
+MAP_SIZES = [(80, 40), (400, 200)]
+RADII = [5, 8, 12, 20]
+SAMPLES = 50
+
+
+def time_algorithm(calculator: FOVCalculator, algorithm: str, positions, radius: int) -> float:
+    """Return mean milliseconds per uncached FOV call."""
+    method = getattr(calculator, FOVCalculator.ALGORITHMS[algorithm])
+    start = time.perf_counter()
+    for x, y in positions:
+        method(x, y, radius)
+    return (time.perf_counter() - start) * 1000 / len(positions)
+
+
+def main():
+    random.seed(1234)
+    print(f"{'map':>9} {'radius':>6} {'simple ms':>10} {'shadowcast ms':>14} {'speedup':>8}")
+    for width, height in MAP_SIZES:
+        generator = DungeonGenerator(width, height)
+        tiles = generator.generate_bsp_dungeon()
+        positions = generator.find_valid_positions(tiles, SAMPLES)
+        calculator = FOVCalculator(TileGrid(tiles))
+        for radius in RADII:
+            simple = time_algorithm(calculator, 'simple', positions, radius)
+            shadow = time_algorithm(calculator, 'shadowcast', positions, radius)
+            print(f"{width}x{height:<5} {radius:>6} {simple:>10.3f} {shadow:>14.3f} "
+                  f"{simple / shadow:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Benchmark level-transition latency with and without pre-generation.
+
+For each descent the diver is placed next to the exit and stepped onto it;
+the time spent inside that move is the latency the player would feel.
+
+    python -m benchmarks.bench_levels
+"""
+
+import statistics
+import time
+
+from game.engine import MOVES, Engine
+
+DESCENTS = 10
+SIZES = [(80, 40), (200, 100)]
+EXPLORE_SECONDS = 0.2    # time the diver spends on a level before descending
+
+
+def step_onto_exit(engine: Engine) -> float:
+    """Move the diver onto the exit and return the move latency in ms."""
+    exit_x, exit_y = engine.game_map.exit_pos
+    for action, (dx, dy) in MOVES.items():
+        if engine.game_map.is_walkable(exit_x - dx, exit_y - dy):
+            engine.player.x, engine.player.y = exit_x - dx, exit_y - dy
+            break
+    start = time.perf_counter()
+    engine.perform(action)
+    return (time.perf_counter() - start) * 1000
+
+
+def measure(width: int, height: int, pregenerate: bool) -> float:
+    engine = Engine(width, height, pregenerate=pregenerate, seed=1234)
+    latencies = []
+    for _ in range(DESCENTS):
+        time.sleep(EXPLORE_SECONDS)
+        latencies.append(step_onto_exit(engine))
+    engine.close()
+    return statistics.median(latencies)
+
+
+def main():
+    print(f"{'map':>9} {'synchronous ms':>15} {'pre-generated ms':>17}")
+    for width, height in SIZES:
+        sync = measure(width, height, pregenerate=False)
+        pre = measure(width, height, pregenerate=True)
+        print(f"{width}x{height:<5} {sync:>15.2f} {pre:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark creature AI cost per turn as the number of creatures grows.
+
+First packs creatures onto open cells around a stationary diver on a cave
+map, with every cell treated as visible, and times ``process_turn``.
+The flow field is built once per turn and shared, so the cost per
+creature should stay roughly flat.
+
+Then fills a large cave with up to 10k creatures and times a full
+``process_turn`` while the diver wanders: creatures far from the diver
+sleep and are never touched, so the population size should barely matter.
+
+    python -m benchmarks.bench_monsters
+"""
+
+import random
+import time
+
+from game.combat import CombatSystem
+from game.fov import VisibilityTracker
+from game.game_map import GameMap
+from game.monster import Monster, MonsterManager, MonsterType
+from game.player import Player
+
+COUNTS = (5, 20, 60)
+POPULATIONS = (100, 1000, 10000)
+TURNS = 200
+
+
+def main():
+    rng = random.Random(1234)
+    game_map = GameMap(120, 60, rng=rng, algorithm='cave')
+    player_x, player_y = game_map.player_start
+    tracker = VisibilityTracker(game_map.width, game_map.height)
+    tracker.update_visibility((x, y) for y in range(game_map.height)
+                              for x in range(game_map.width))
+    nearby = [(index % game_map.width, index // game_map.width)
+              for index in MonsterManager.build_flow_field(player_x, player_y,
+                                                           game_map.tiles, 12)]
+    nearby.remove((player_x, player_y))
+    player = Player(player_x, player_y)
+    combat_system = CombatSystem(rng)
+
+    print(f"{'creatures':>9} {'ms/turn':>8} {'us/creature':>12}")
+    for count in COUNTS:
+        total = 0.0
+        positions = rng.sample(nearby, min(count, len(nearby)))
+        for _ in range(TURNS):
+            monster_manager = MonsterManager(rng)
+            for x, y in positions:
+                monster_manager.add_monster(Monster(x, y, MonsterType.JELLYFISH))
+            player.hp = player.max_hp
+            start = time.perf_counter()
+            combat_system.process_turn(player, monster_manager, game_map.tiles, tracker)
+            total += time.perf_counter() - start
+        per_turn = total * 1000 / TURNS
+        print(f"{len(positions):>9} {per_turn:>8.3f} {per_turn * 1000 / len(positions):>12.1f}")
+
+    print(f"\n{'population':>10} {'ms/turn':>8}")
+    for population in POPULATIONS:
+        rng = random.Random(1234)
+        game_map = GameMap(800, 400, rng=rng, algorithm='cave')
+        player = Player(*game_map.player_start)
+        monster_manager = MonsterManager(rng)
+        monster_manager.spawn_monsters(game_map, population, 1, rng)
+        combat_system = CombatSystem(rng)
+        total = 0.0
+        for _ in range(TURNS):
+            player.move(*rng.choice([(0, -1), (0, 1), (-1, 0), (1, 0)]), game_map.tiles)
+            player.hp = player.max_hp
+            game_map.update_fov(player.x, player.y)
+            start = time.perf_counter()
+            combat_system.process_turn(player, monster_manager, game_map.tiles,
+                                       game_map.visibility_tracker)
+            total += time.perf_counter() - start
+        print(f"{len(monster_manager.store):>10} {total * 1000 / TURNS:>8.3f} "
+              f"({monster_manager.awake_count} awake at the end)")
+
+
+if __name__ == "__main__":
+    main()
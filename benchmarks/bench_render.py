@@ -0,0 +1,82 @@
+"""Benchmark map frame production: markup parsing vs cached Strips.
+
+Replays random moves on a populated level and times, per turn, the markup
+path (whole frame -> Textual markup parse -> segments) with one span per
+cell and with run-length coalesced spans, against the line API path
+(rebuild Strips for the rows in the frame diff).
+
+    python -m benchmarks.bench_render
+"""
+
+import random
+import time
+
+from textual.content import Content
+
+from game.ascii_art import get_colored_char
+from game.game_map import GameMap
+from game.items import ItemManager
+from game.monster import MonsterManager
+from game.player import Player
+from main import MAP_BASE_MARKUP, cells_to_strip
+
+TURNS = 300
+
+
+def per_cell_markup(rows) -> str:
+    return '\n'.join(''.join(get_colored_char(char, color) if color else char
+                              for char, color in cells) for cells in rows)
+
+
+def parse_time(markup: str) -> float:
+    start = time.perf_counter()
+    content = Content.from_markup(f"{MAP_BASE_MARKUP}{markup}[/]")
+    list(content.render_segments())
+    return time.perf_counter() - start
+
+
+def main():
+    random.seed(1234)
+    game_map = GameMap()
+    game_map.place_exit()
+    player = Player(*game_map.player_start)
+    monster_manager = MonsterManager()
+    monster_manager.spawn_monsters(game_map, 10, 3)
+    item_manager = ItemManager()
+    item_manager.spawn_items(game_map, 12)
+    styles = {}
+
+    per_cell_time = 0.0
+    per_cell_size = 0
+    markup_time = 0.0
+    markup_size = 0
+    strip_time = 0.0
+    rows_rebuilt = 0
+    for _ in range(TURNS):
+        player.move(*random.choice([(0, -1), (0, 1), (-1, 0), (1, 0)]), game_map.tiles)
+        game_map.update_fov(player.x, player.y)
+        changed = game_map.render_frame_diff(player.x, player.y, monster_manager, item_manager)
+
+        baseline = per_cell_markup(game_map.renderer.cells)
+        per_cell_time += parse_time(baseline)
+        per_cell_size += len(baseline)
+        frame = game_map.renderer.frame()
+        markup_time += parse_time(frame)
+        markup_size += len(frame)
+
+        start = time.perf_counter()
+        for y in changed:
+            cells_to_strip(game_map.renderer.cells[y], styles)
+        strip_time += time.perf_counter() - start
+        rows_rebuilt += len(changed)
+
+    print(f"per-cell markup parse:    {per_cell_time * 1000 / TURNS:.3f} ms "
+          f"({per_cell_size // TURNS} chars)")
+    print(f"coalesced markup parse:   {markup_time * 1000 / TURNS:.3f} ms "
+          f"({markup_size // TURNS} chars)")
+    print(f"strip rebuild per frame:  {strip_time * 1000 / TURNS:.3f} ms "
+          f"({rows_rebuilt / TURNS:.1f} rows/turn)")
+
+
+if __name__ == "__main__":
+    main()
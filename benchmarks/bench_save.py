@@ -0,0 +1,59 @@
+"""Benchmark saving and loading a dive on a 1000x1000 cave.
+
+The level is populated with thousands of creatures and items and half of
+it is marked explored, then the dive is snapshotted, written and loaded
+back a few times. ``snapshot`` is the only part of an autosave that runs
+on the game thread; the write happens on a worker.
+
+    python -m benchmarks.bench_save
+"""
+
+import os
+import statistics
+import tempfile
+import time
+
+from game.engine import Engine
+from game.save import load_game, snapshot, write_snapshot
+
+SIZE = 1000
+REPEATS = 5
+
+
+def timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    start = time.perf_counter()
+    engine = Engine(SIZE, SIZE, pregenerate=False, seed=1234, map_algorithm='cave')
+    build_time = time.perf_counter() - start
+    game_map = engine.game_map
+    engine.monster_manager.spawn_monsters(game_map, SIZE * SIZE // 200, 3, engine.level_rng.spawns)
+    engine.item_manager.spawn_items(game_map, SIZE * SIZE // 500, engine.level_rng.spawns)
+    explored = game_map.visibility_tracker.explored_grid
+    explored[:len(explored) // 2] = b'\x01' * (len(explored) // 2)
+    print(f"{SIZE}x{SIZE} cave built in {build_time:.1f}s, "
+          f"{len(engine.monster_manager.store)} creatures, {len(engine.item_manager.items)} items")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "dive.sav")
+        snapshot_times, write_times, load_times = [], [], []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            body = snapshot(engine)
+            snapshot_times.append((time.perf_counter() - start) * 1000)
+            write_times.append(timed(write_snapshot, path, body))
+            load_times.append(timed(lambda: load_game(path, pregenerate=False).close()))
+        size = os.path.getsize(path)
+
+    print(f"{'snapshot ms':>12} {'write ms':>9} {'load ms':>8} {'file KiB':>9}")
+    print(f"{statistics.median(snapshot_times):>12.1f} {statistics.median(write_times):>9.1f} "
+          f"{statistics.median(load_times):>8.1f} {size / 1024:>9.0f}")
+    engine.close()
+
+
+if __name__ == "__main__":
+    main()
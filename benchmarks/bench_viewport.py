@@ -0,0 +1,54 @@
+"""Benchmark viewport rendering on maps far larger than the terminal.
+
+Builds cave maps of increasing size, fixes the viewport to a typical
+terminal window and times a frame diff per turn while the diver wanders,
+so the camera scrolls on almost every move. Per-turn cost should stay flat
+as the world grows.
+
+    python -m benchmarks.bench_viewport
+"""
+
+import random
+import time
+
+from game.game_map import GameMap
+from game.items import ItemManager
+from game.monster import MonsterManager
+from game.player import Player
+
+SIZES = (80, 500, 2000)
+VIEWPORT = (100, 40)
+TURNS = 300
+
+
+def main():
+    for size in SIZES:
+        rng = random.Random(1234)
+        start = time.perf_counter()
+        game_map = GameMap(size, size, rng=rng, algorithm='cave')
+        build_time = time.perf_counter() - start
+        player = Player(*game_map.player_start)
+        monster_manager = MonsterManager(rng)
+        monster_manager.spawn_monsters(game_map, size * size // 600, 3, rng)
+        item_manager = ItemManager(rng)
+        item_manager.spawn_items(game_map, size * size // 500, rng)
+        game_map.renderer.set_viewport(*VIEWPORT)
+
+        render_time = 0.0
+        rows_rebuilt = 0
+        for _ in range(TURNS):
+            player.move(*rng.choice([(0, -1), (0, 1), (-1, 0), (1, 0)]), game_map.tiles)
+            game_map.update_fov(player.x, player.y)
+            start = time.perf_counter()
+            changed = game_map.render_frame_diff(player.x, player.y,
+                                                 monster_manager, item_manager)
+            render_time += time.perf_counter() - start
+            rows_rebuilt += len(changed)
+
+        print(f"{size:>5}x{size:<5} build {build_time:6.2f} s  "
+              f"render {render_time * 1000 / TURNS:6.3f} ms/turn  "
+              f"({rows_rebuilt / TURNS:.1f} rows/turn)")
+
+
+if __name__ == "__main__":
+    main()
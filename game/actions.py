@@ -0,0 +1,28 @@
+"""Creature actions for Terminus Veil."""
+
+
+class Action:
+    """What one creature does on its turn; resolved once by CombatSystem."""
+    
+    def __init__(self, monster):
+        self.monster = monster
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.monster.name} at {self.monster.x},{self.monster.y})"
+
+
+class IdleAction(Action):
+    """The creature waits."""
+
+
+class MoveAction(Action):
+    """The creature steps to (x, y)."""
+    
+    def __init__(self, monster, x: int, y: int):
+        super().__init__(monster)
+        self.x = x
+        self.y = y
+
+
+class AttackAction(Action):
+    """The creature strikes the diver."""
@@ -1,6 +1,6 @@
 """ASCII art and visual improvements for Terminus Veil."""
 
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 
 
 class ASCIIChars:
@@ -42,54 +42,85 @@ class ASCIIChars:
     FLOOR_EXPLORED = "░"
 
 
+# Connectivity bits used to index WALL_GLYPHS.
+WALL_UP = 1
+WALL_RIGHT = 2
+WALL_DOWN = 4
+WALL_LEFT = 8
+
+# Wall glyph for every 4-bit connectivity mask (up | right | down | left).
+WALL_GLYPHS = (
+    ASCIIChars.WALL_VERTICAL,       # 0: isolated
+    ASCIIChars.WALL_VERTICAL,       # 1: up
+    ASCIIChars.WALL_HORIZONTAL,     # 2: right
+    ASCIIChars.WALL_BOTTOM_RIGHT,   # 3: up, right
+    ASCIIChars.WALL_VERTICAL,       # 4: down
+    ASCIIChars.WALL_VERTICAL,       # 5: up, down
+    ASCIIChars.WALL_TOP_RIGHT,      # 6: right, down
+    ASCIIChars.WALL_T_LEFT,         # 7: up, right, down
+    ASCIIChars.WALL_HORIZONTAL,     # 8: left
+    ASCIIChars.WALL_BOTTOM_LEFT,    # 9: up, left
+    ASCIIChars.WALL_HORIZONTAL,     # 10: right, left
+    ASCIIChars.WALL_T_UP,           # 11: up, right, left
+    ASCIIChars.WALL_TOP_LEFT,       # 12: down, left
+    ASCIIChars.WALL_T_RIGHT,        # 13: up, down, left
+    ASCIIChars.WALL_T_DOWN,         # 14: right, down, left
+    ASCIIChars.WALL_CROSS,          # 15: all four
+)
+
+
 class WallRenderer:
-    """Handles intelligent wall rendering (unchanged logic, only visual)."""
+    """Handles intelligent wall rendering.
+    
+    Glyphs are computed a whole row at a time the first time the row is
+    drawn and then cached, so drawing a wall is a single list read and huge
+    maps only pay for the rows the camera has shown. Call ``refresh`` after
+    mutating a tile to drop the cached rows around it.
+    """
     
     def __init__(self, game_map):
         self.game_map = game_map
-        self.height = len(game_map)
-        self.width = len(game_map[0]) if game_map else 0
+        self.opaque = game_map.opaque
+        self.height = game_map.height
+        self.width = game_map.width
+        self._rows: List[Optional[List[str]]] = [None] * self.height
     
     def get_wall_char(self, x: int, y: int) -> str:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.row_glyphs(y)[x]
+        return self._compute_glyph(x, y)
+    
+    def row_glyphs(self, y: int) -> List[str]:
+        """Glyphs for every cell of row ``y``."""
+        row = self._rows[y]
+        if row is None:
+            row = self._rows[y] = [self._compute_glyph(x, y) for x in range(self.width)]
+        return row
+    
+    def refresh(self, x: int, y: int):
+        """Forget the cached glyphs of a changed cell's row and the rows beside it."""
+        for cy in (y - 1, y, y + 1):
+            if 0 <= cy < self.height:
+                self._rows[cy] = None
+    
+    def _compute_glyph(self, x: int, y: int) -> str:
         if not self._is_wall(x, y):
             return ASCIIChars.FLOOR
-        
-        up = self._is_wall(x, y - 1)
-        down = self._is_wall(x, y + 1)
-        left = self._is_wall(x - 1, y)
-        right = self._is_wall(x + 1, y)
-        
-        connections = (up, right, down, left)
-        
-        if connections == (True, True, True, True):
-            return ASCIIChars.WALL_CROSS
-        elif connections == (False, True, True, True):
-            return ASCIIChars.WALL_T_DOWN
-        elif connections == (True, False, True, True):
-            return ASCIIChars.WALL_T_RIGHT
-        elif connections == (True, True, False, True):
-            return ASCIIChars.WALL_T_UP
-        elif connections == (True, True, True, False):
-            return ASCIIChars.WALL_T_LEFT
-        elif connections == (False, False, True, True):
-            return ASCIIChars.WALL_TOP_LEFT
-        elif connections == (False, True, True, False):
-            return ASCIIChars.WALL_TOP_RIGHT
-        elif connections == (True, False, False, True):
-            return ASCIIChars.WALL_BOTTOM_LEFT
-        elif connections == (True, True, False, False):
-            return ASCIIChars.WALL_BOTTOM_RIGHT
-        elif connections in [(True, False, True, False), (False, False, False, False)]:
-            return ASCIIChars.WALL_VERTICAL
-        elif connections == (False, True, False, True):
-            return ASCIIChars.WALL_HORIZONTAL
-        else:
-            return ASCIIChars.WALL_VERTICAL if (up or down) else ASCIIChars.WALL_HORIZONTAL
+        mask = 0
+        if self._is_wall(x, y - 1):
+            mask |= WALL_UP
+        if self._is_wall(x + 1, y):
+            mask |= WALL_RIGHT
+        if self._is_wall(x, y + 1):
+            mask |= WALL_DOWN
+        if self._is_wall(x - 1, y):
+            mask |= WALL_LEFT
+        return WALL_GLYPHS[mask]
     
     def _is_wall(self, x: int, y: int) -> bool:
         if x < 0 or x >= self.width or y < 0 or y >= self.height:
             return True
-        return self.game_map[y][x] == '#'
+        return self.opaque[y * self.width + x] == 1
 
 
 class ColorScheme:
@@ -120,8 +151,24 @@ class ColorScheme:
     RESET = "[/]"
 
 
+def _public_strings(cls) -> list:
+    return [value for name, value in vars(cls).items()
+            if not name.startswith('_') and isinstance(value, str)]
+
+
+# Interned markup for every (glyph, color) pair the game can draw.
+GLYPH_MARKUP: Dict[Tuple[str, str], str] = {
+    (char, color): f"{color}{char}{ColorScheme.RESET}"
+    for char in _public_strings(ASCIIChars)
+    for color in _public_strings(ColorScheme) if color != ColorScheme.RESET
+}
+
+
 def get_colored_char(char: str, color: str) -> str:
-    return f"{color}{char}{ColorScheme.RESET}"
+    markup = GLYPH_MARKUP.get((char, color))
+    if markup is None:
+        markup = f"{color}{char}{ColorScheme.RESET}"
+    return markup
 
 
 def get_entity_display(entity_type: str, is_alive: bool = True) -> str:
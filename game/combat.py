@@ -2,83 +2,88 @@
 
 import random
 from typing import List, Tuple, Optional
+from .actions import Action, AttackAction, IdleAction, MoveAction
+from .events import Event, EventType
 from .monster import Monster
+from .tiles import EXIT
 
 
 class CombatSystem:
     """Handles underwater combat and turn order."""
     
-    def __init__(self):
+    RESOLVERS = {
+        AttackAction: '_resolve_attack',
+        MoveAction: '_resolve_move',
+        IdleAction: '_resolve_idle',
+    }
+    
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng if rng is not None else random
         self.turn_count = 0
-        self.combat_log: List[str] = []
     
-    def player_attack_monster(self, player, monster: Monster) -> List[str]:
-        messages = []
+    def player_attack_monster(self, player, monster: Monster) -> List[Event]:
         if not monster.is_alive:
-            messages.append(f"The {monster.name} is already dead.")
-            return messages
-
+            return [Event(EventType.MESSAGE, "The {name} is already dead.", name=monster.name)]
+        
         base_damage = player.attack_power
-        damage = random.randint(max(1, base_damage - 2), base_damage + 3)
+        damage = self.rng.randint(max(1, base_damage - 2), base_damage + 3)
         
         monster_died = monster.take_damage(damage)
         
-        messages.append(f"You fire your harpoon at the {monster.name} for {damage} damage!")
+        events = [Event(EventType.ATTACK, "You fire your harpoon at the {name} for {damage} damage!",
+                        name=monster.name, damage=damage)]
         
         if monster_died:
-            messages.append(f"The {monster.name} dissolves into the deep.")
+            events.append(Event(EventType.DEATH, "The {name} dissolves into the deep.",
+                                name=monster.name))
         else:
-            messages.append(f"The {monster.name} has {monster.hp}/{monster.max_hp} health remaining.")
+            events.append(Event(EventType.MESSAGE, "The {name} has {hp}/{max_hp} health remaining.",
+                                name=monster.name, hp=monster.hp, max_hp=monster.max_hp))
         
-        return messages
+        return events
     
-    def monster_attack_player(self, monster: Monster, player) -> List[str]:
-        messages = []
+    def monster_attack_player(self, monster: Monster, player) -> Optional[Event]:
         if not monster.is_alive:
-            return messages
+            return None
         
-        damage = monster.attack(player)
+        damage = monster.attack(player, self.rng)
         player.take_damage(damage)
         
-        messages.append(f"The {monster.name} strikes you for {damage} damage!")
-        
         if not player.is_alive():
-            messages.append("Oxygen depleted! Mission failed.")
+            template = "The {name} strikes you for {damage} damage! Oxygen depleted! Mission failed."
         else:
-            messages.append(f"You have {player.hp}/{player.max_hp} oxygen remaining.")
-        
-        return messages
+            template = ("The {name} strikes you for {damage} damage! "
+                        "You have {hp}/{max_hp} oxygen remaining.")
+        return Event(EventType.DAMAGE, template, name=monster.name, damage=damage,
+                     hp=player.hp, max_hp=player.max_hp)
     
-    def process_turn(self, player, monster_manager, game_map, visibility_tracker) -> List[str]:
-        self.turn_count += 1
-        all_messages = []
+    def process_turn(self, player, monster_manager, game_map, visibility_tracker) -> List[Event]:
+        """Resolve every creature action due this turn in a single pass.
         
-        monster_messages = monster_manager.update_monsters(
-            player.x, player.y, game_map, visibility_tracker
-        )
-        all_messages.extend(monster_messages)
+        Each action is applied exactly once and yields at most one event;
+        idle creatures yield none.
+        """
+        self.turn_count += 1
+        events = []
         
-        for monster in monster_manager.monsters:
-            if (monster.is_alive and 
-                monster.is_adjacent_to(player.x, player.y) and
-                visibility_tracker.is_visible(monster.x, monster.y)):
-                
-                combat_messages = self.monster_attack_player(monster, player)
-                all_messages.extend(combat_messages)
+        for action in monster_manager.take_turns(player.x, player.y, game_map,
+                                                 visibility_tracker):
+            event = getattr(self, self.RESOLVERS[type(action)])(action, player, monster_manager)
+            if event:
+                events.append(event)
         
         monster_manager.remove_dead_monsters()
-        
-        self.combat_log.extend(all_messages)
-        if len(self.combat_log) > 10:
-            self.combat_log = self.combat_log[-10:]
-        
-        return all_messages
+        return events
+    
+    def _resolve_attack(self, action: Action, player, monster_manager) -> Optional[Event]:
+        return self.monster_attack_player(action.monster, player)
     
-    def get_recent_messages(self, count: int = 5) -> List[str]:
-        return self.combat_log[-count:] if self.combat_log else []
+    def _resolve_move(self, action: Action, player, monster_manager) -> Event:
+        monster_manager.move_monster(action.monster, action.x, action.y)
+        return Event(EventType.CREATURE_MOVE)
     
-    def clear_log(self):
-        self.combat_log.clear()
+    def _resolve_idle(self, action: Action, player, monster_manager) -> None:
+        return None
 
 
 class GameState:
@@ -91,9 +96,7 @@ class GameState:
         self.score = 0
     
     def check_victory_condition(self, player_x: int, player_y: int, game_map) -> bool:
-        if (0 <= player_x < len(game_map[0]) and 
-            0 <= player_y < len(game_map) and
-            game_map[player_y][player_x] == '>'):
+        if game_map.get(player_x, player_y) == EXIT.char:
             self.victory = True
             return True
         return False
@@ -109,11 +112,11 @@ class GameState:
         self.victory = False
         self.score += 100 * self.current_level
     
-    def get_monster_count_for_level(self) -> int:
-        return min(3 + self.current_level, 10)
+    def get_monster_count_for_level(self, level: Optional[int] = None) -> int:
+        return min(3 + (level or self.current_level), 10)
     
-    def get_item_count_for_level(self) -> int:
-        return min(5 + self.current_level, 12)
+    def get_item_count_for_level(self, level: Optional[int] = None) -> int:
+        return min(5 + (level or self.current_level), 12)
     
     def add_score(self, points: int):
         self.score += points
@@ -0,0 +1,211 @@
+"""Creature and item definitions for Terminus Veil.
+
+Content is declared once in ``CREATURES`` and ``ITEMS`` and compiled at
+import time into the ``MonsterType`` / ``ItemType`` enums, per-type
+definition lookups, cumulative spawn weights and item effect dispatch.
+Adding a creature or an item is an edit to these tables.
+"""
+
+import bisect
+import random
+from enum import Enum
+from typing import Callable, Dict, List, Tuple
+from .ascii_art import ASCIIChars, ColorScheme
+
+
+# ``spawn`` maps the first depth an entry applies from to its weight; a
+# weight holds until a deeper entry replaces it. Missing depths weigh 0.
+CREATURES = {
+    'JELLYFISH': {
+        'symbol': ASCIIChars.JELLYFISH, 'style': ColorScheme.JELLYFISH,
+        'name': "Jellyfish", 'hp': 20, 'attack': 5,
+        'speed': 50,        # drifts, acting every other turn
+        'spawn': {1: 80, 2: 50, 4: 30},
+    },
+    'ANGLERFISH': {
+        'symbol': ASCIIChars.ANGLERFISH, 'style': ColorScheme.ANGLERFISH,
+        'name': "Anglerfish", 'hp': 35, 'attack': 8,
+        'speed': 150,       # darts
+        'spawn': {1: 20, 2: 40, 4: 40},
+    },
+    'LEVIATHAN': {
+        'symbol': ASCIIChars.LEVIATHAN, 'style': ColorScheme.LEVIATHAN,
+        'name': "Leviathan", 'hp': 100, 'attack': 15,
+        'speed': 100,
+        'spawn': {2: 10, 4: 30},
+    },
+}
+
+# Every level below the first adds this much to a spawned creature.
+DEPTH_HP_BONUS = 5
+DEPTH_ATTACK_BONUS = 2
+
+# ``value`` is the (low, high) range rolled at spawn; ``effect`` names an
+# entry of ITEM_EFFECTS. Data items count towards the score instead of
+# going into the inventory.
+ITEMS = {
+    'RESEARCH_DATA': {
+        'symbol': ASCIIChars.RESEARCH_DATA, 'style': ColorScheme.RESEARCH_DATA,
+        'name': "Research Data", 'description': "Valuable research data",
+        'weight': 40, 'value': (5, 20), 'effect': 'collect_data', 'data': True,
+    },
+    'OXYGEN_TANK': {
+        'symbol': ASCIIChars.OXYGEN_TANK, 'style': ColorScheme.OXYGEN_TANK,
+        'name': "Oxygen Tank", 'description': "Restores 25 oxygen",
+        'weight': 30, 'effect': 'restore_oxygen', 'amount': 25,
+    },
+    'SIGNAL_FLARE': {
+        'symbol': ASCIIChars.SIGNAL_FLARE, 'style': ColorScheme.SIGNAL_FLARE,
+        'name': "Signal Flare", 'description': "A flare that may attract help?",
+        'weight': 20, 'effect': 'signal_flare',
+    },
+    'HARPOON_UPGRADE': {
+        'symbol': ASCIIChars.HARPOON_UPGRADE, 'style': ColorScheme.HARPOON_UPGRADE,
+        'name': "Harpoon Upgrade", 'description': "Increases harpoon strength",
+        'weight': 10, 'effect': 'upgrade_harpoon', 'amount': 5,
+    },
+}
+
+
+def _restore_oxygen(item, player, rng) -> str:
+    heal_amount = min(item.definition.amount, player.max_hp - player.hp)
+    player.hp += heal_amount
+    return f"You use the oxygen tank and recover {heal_amount} oxygen!"
+
+
+def _signal_flare(item, player, rng) -> str:
+    effect = rng.choice(["heal", "damage_boost", "nothing"])
+    if effect == "heal":
+        heal_amount = rng.randint(10, 30)
+        player.hp = min(player.max_hp, player.hp + heal_amount)
+        return f"The flare's glow revitalizes you! +{heal_amount} oxygen."
+    elif effect == "damage_boost":
+        player.attack_power += 2
+        return "The flare sharpens your senses! Harpoon Strength +2!"
+    return "The flare fizzles. Nothing happens."
+
+
+def _upgrade_harpoon(item, player, rng) -> str:
+    player.attack_power += item.definition.amount
+    return f"You upgrade your harpoon! Strength increased by {item.definition.amount}!"
+
+
+def _collect_data(item, player, rng) -> str:
+    return f"You collect {item.value} research data points."
+
+
+def _unusable(item, player, rng) -> str:
+    return f"You can't use the {item.name}."
+
+
+ITEM_EFFECTS: Dict[str, Callable[..., str]] = {
+    'restore_oxygen': _restore_oxygen,
+    'signal_flare': _signal_flare,
+    'upgrade_harpoon': _upgrade_harpoon,
+    'collect_data': _collect_data,
+}
+
+
+MonsterType = Enum('MonsterType', [
+    (key, (entry['symbol'], entry['hp'], entry['attack'], entry['name']))
+    for key, entry in CREATURES.items()
+], module=__name__)
+MonsterType.__doc__ = "Underwater creatures."
+
+ItemType = Enum('ItemType', [
+    (key, (entry['symbol'], entry['name'], entry['description']))
+    for key, entry in ITEMS.items()
+], module=__name__)
+ItemType.__doc__ = "Underwater item types."
+
+
+class CreatureDef:
+    """A compiled ``CREATURES`` entry."""
+    
+    def __init__(self, monster_type: MonsterType, entry: dict):
+        self.monster_type = monster_type
+        self.code = len(CREATURE_DEFS)
+        self.symbol = entry['symbol']
+        self.style = entry['style']
+        self.name = entry['name']
+        self.hp = entry['hp']
+        self.attack = entry['attack']
+        self.speed = entry['speed']
+        self.spawn: Dict[int, int] = entry.get('spawn', {})
+    
+    def weight_at(self, depth: int) -> int:
+        weight = 0
+        for first_depth in sorted(self.spawn):
+            if first_depth > depth:
+                break
+            weight = self.spawn[first_depth]
+        return weight
+
+
+class ItemDef:
+    """A compiled ``ITEMS`` entry; ``use`` is its effect function."""
+    
+    def __init__(self, item_type: ItemType, entry: dict):
+        self.item_type = item_type
+        self.symbol = entry['symbol']
+        self.style = entry['style']
+        self.name = entry['name']
+        self.description = entry['description']
+        self.weight = entry.get('weight', 0)
+        self.value: Tuple[int, int] = entry.get('value', (1, 1))
+        self.amount = entry.get('amount', 0)
+        self.is_data = entry.get('data', False)
+        self.use = ITEM_EFFECTS.get(entry.get('effect'), _unusable)
+    
+    def roll_value(self, rng) -> int:
+        low, high = self.value
+        return low if low == high else rng.randint(low, high)
+
+
+# Indexed by the creature code stored in MonsterStore.types.
+CREATURE_DEFS: List[CreatureDef] = []
+for _monster_type in MonsterType:
+    CREATURE_DEFS.append(CreatureDef(_monster_type, CREATURES[_monster_type.name]))
+CREATURE_BY_TYPE: Dict[MonsterType, CreatureDef] = {
+    definition.monster_type: definition for definition in CREATURE_DEFS
+}
+
+ITEM_DEFS: Dict[ItemType, ItemDef] = {
+    item_type: ItemDef(item_type, ITEMS[item_type.name]) for item_type in ItemType
+}
+
+
+class SpawnTable:
+    """Weighted choice by bisecting a precomputed cumulative weight list."""
+    
+    def __init__(self, weighted: List[Tuple[object, int]]):
+        self.choices = [choice for choice, weight in weighted if weight > 0]
+        self.cumulative: List[int] = []
+        total = 0
+        for choice, weight in weighted:
+            if weight > 0:
+                total += weight
+                self.cumulative.append(total)
+        self.total = total
+    
+    def roll(self, rng=None):
+        rand = (rng if rng is not None else random).random()
+        return self.choices[bisect.bisect_right(self.cumulative, rand * self.total)]
+
+
+# Depth bands only change where some ``spawn`` entry starts, so each band
+# is compiled once and deeper levels share the last one.
+_CREATURE_BANDS = sorted({depth for definition in CREATURE_DEFS for depth in definition.spawn})
+_creature_tables: Dict[int, SpawnTable] = {}
+
+ITEM_SPAWNS = SpawnTable([(definition, definition.weight) for definition in ITEM_DEFS.values()])
+
+
+def creature_spawns(depth: int) -> SpawnTable:
+    """Spawn table of creature definitions for a level."""
+    band = _CREATURE_BANDS[max(0, bisect.bisect_right(_CREATURE_BANDS, depth) - 1)]
+    table = _creature_tables.get(band)
+    if table is None:
+        table = _creature_tables[band] = SpawnTable(
+            [(definition, definition.weight_at(band)) for definition in CREATURE_DEFS])
+    return table
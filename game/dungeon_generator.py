@@ -1,15 +1,107 @@
-"""Procedural dungeon generation (unchanged logic, only comments)."""
+"""Procedural dungeon generation."""
 
 import random
-from typing import Tuple, List, Set
+from array import array
+from collections import deque
+from typing import Tuple, List, Optional, Set
+from .tiles import TileGrid, walkable_layer
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; caves fall back to pure Python
+    np = None
 
 
 class DungeonGenerator:
-    """Generates procedural underwater caves (same algorithms)."""
+    """Generates procedural underwater caves."""
+    
+    ALGORITHMS = {
+        'bsp': 'generate_bsp_dungeon',
+        'cave': 'generate_cave',
+        'walk': 'generate_random_walk',
+    }
     
-    def __init__(self, width: int, height: int):
+    def __init__(self, width: int, height: int, rng: Optional[random.Random] = None):
         self.width = width
         self.height = height
+        self.rng = rng if rng is not None else random
+    
+    def generate(self, algorithm: str = 'bsp') -> List[List[str]]:
+        """Dispatch to one of the generators listed in ALGORITHMS."""
+        method = self.ALGORITHMS.get(algorithm)
+        if method is None:
+            raise ValueError(f"Unknown dungeon algorithm: {algorithm}")
+        return getattr(self, method)()
+    
+    def generate_cave(self, fill: float = 0.45, iterations: int = 4) -> List[List[str]]:
+        """Cellular-automata caves: random fill, then repeated smoothing.
+        
+        A cell becomes rock when at least 5 of its 8 neighbours are rock, and
+        stays rock with 4. Uses whole-array NumPy operations when available.
+        """
+        if np is not None:
+            walls = self._cave_walls_numpy(fill, iterations)
+            rows = np.where(walls, ord('#'), ord('.')).astype(np.uint8)
+            return [list(row.tobytes().decode('ascii')) for row in rows]
+        return self._generate_cave_python(fill, iterations)
+    
+    def _cave_walls_numpy(self, fill: float, iterations: int):
+        width, height = self.width, self.height
+        walls = np.ones((height, width), dtype=bool)
+        walls[1:-1, 1:-1] = self._random_floats((height - 2) * (width - 2)).reshape(
+            max(0, height - 2), max(0, width - 2)) < fill
+        for _ in range(iterations):
+            padded = np.pad(walls, 1, constant_values=True).astype(np.uint8)
+            neighbours = (
+                padded[:-2, :-2] + padded[:-2, 1:-1] + padded[:-2, 2:] +
+                padded[1:-1, :-2] + padded[1:-1, 2:] +
+                padded[2:, :-2] + padded[2:, 1:-1] + padded[2:, 2:]
+            )
+            walls = (neighbours >= 5) | (walls & (neighbours == 4))
+            self._seal_border(walls)
+        return walls
+    
+    def _random_floats(self, count: int):
+        """The next ``count`` values ``self.rng.random()`` would return.
+        
+        ``random()`` builds each float from two 32-bit Mersenne Twister words
+        and ``getrandbits`` hands out the same words in order, so one call
+        replays the stream the pure-Python fill draws cell by cell.
+        """
+        if count <= 0:
+            return np.zeros(0)
+        words = np.frombuffer(self.rng.getrandbits(64 * count).to_bytes(8 * count, 'little'),
+                              dtype='<u4')
+        high, low = words[0::2] >> 5, words[1::2] >> 6
+        return (high * 67108864.0 + low) * (1.0 / 9007199254740992.0)
+    
+    @staticmethod
+    def _seal_border(walls):
+        walls[0, :] = True
+        walls[-1, :] = True
+        walls[:, 0] = True
+        walls[:, -1] = True
+    
+    def _generate_cave_python(self, fill: float, iterations: int) -> List[List[str]]:
+        width, height = self.width, self.height
+        rng = self.rng
+        walls = [[x == 0 or y == 0 or x == width - 1 or y == height - 1 or rng.random() < fill
+                  for x in range(width)] for y in range(height)]
+        for _ in range(iterations):
+            smoothed = []
+            for y in range(height):
+                row = []
+                for x in range(width):
+                    if x == 0 or y == 0 or x == width - 1 or y == height - 1:
+                        row.append(True)
+                        continue
+                    neighbours = (walls[y - 1][x - 1] + walls[y - 1][x] + walls[y - 1][x + 1] +
+                                  walls[y][x - 1] + walls[y][x + 1] +
+                                  walls[y + 1][x - 1] + walls[y + 1][x] + walls[y + 1][x + 1])
+                    row.append(neighbours >= 5 or (walls[y][x] and neighbours == 4))
+                smoothed.append(row)
+            walls = smoothed
+        return [['#' if wall else '.' for wall in row] for row in walls]
     
     def generate_random_walk(self, steps: int = 1000) -> List[List[str]]:
         dungeon = [['#' for _ in range(self.width)] for _ in range(self.height)]
@@ -19,7 +111,7 @@ class DungeonGenerator:
         for _ in range(steps):
             if 1 <= x < self.width - 1 and 1 <= y < self.height - 1:
                 dungeon[y][x] = '.'
-            dx, dy = random.choice(directions)
+            dx, dy = self.rng.choice(directions)
             new_x, new_y = x + dx, y + dy
             if 1 <= new_x < self.width - 1 and 1 <= new_y < self.height - 1:
                 x, y = new_x, new_y
@@ -43,19 +135,19 @@ class DungeonGenerator:
         if width < min_size * 2 or height < min_size * 2:
             room_width = max(3, width - 2)
             room_height = max(3, height - 2)
-            room_x = x + random.randint(0, max(0, width - room_width))
-            room_y = y + random.randint(0, max(0, height - room_height))
+            room_x = x + self.rng.randint(0, max(0, width - room_width))
+            room_y = y + self.rng.randint(0, max(0, height - room_height))
             rooms.append((room_x, room_y, room_width, room_height))
             return rooms
         
-        split_horizontal = random.choice([True, False])
+        split_horizontal = self.rng.choice([True, False])
         if split_horizontal:
-            split_point = random.randint(min_size, height - min_size)
+            split_point = self.rng.randint(min_size, height - min_size)
             rooms.extend(self._split_space(x, y, width, split_point, min_size))
             rooms.extend(self._split_space(x, y + split_point, width, 
                                          height - split_point, min_size))
         else:
-            split_point = random.randint(min_size, width - min_size)
+            split_point = self.rng.randint(min_size, width - min_size)
             rooms.extend(self._split_space(x, y, split_point, height, min_size))
             rooms.extend(self._split_space(x + split_point, y, 
                                          width - split_point, height, min_size))
@@ -86,6 +178,294 @@ class DungeonGenerator:
             if 0 <= x2 < self.width and 0 <= y < self.height:
                 dungeon[y][x2] = '.'
     
+    def label_regions(self, dungeon: List[List[str]]) -> Tuple[List[int], List[int]]:
+        """Label 4-connected open regions in one linear flood-fill pass.
+        
+        Returns flat row-major labels (-1 for rock and the map border) and
+        the size of each region. Labels are numbered in scan order of each
+        region's first cell, with or without NumPy.
+        """
+        if np is not None:
+            labels, sizes = self._label_regions_numpy(self._interior_open_cells(dungeon))
+            return labels.tolist(), sizes
+        width, height = self.width, self.height
+        unvisited = self._interior_open_cells(dungeon)
+        labels = [-1] * (width * height)
+        sizes = []
+        index = unvisited.find(1)
+        while index != -1:
+            label = len(sizes)
+            unvisited[index] = 0
+            labels[index] = label
+            stack = [index]
+            count = 0
+            while stack:
+                cell = stack.pop()
+                count += 1
+                for neighbour in (cell - 1, cell + 1, cell - width, cell + width):
+                    if unvisited[neighbour]:
+                        unvisited[neighbour] = 0
+                        labels[neighbour] = label
+                        stack.append(neighbour)
+            sizes.append(count)
+            index = unvisited.find(1, index + 1)
+        return labels, sizes
+    
+    def _label_regions_numpy(self, open_cells: bytearray):
+        """Union-find over horizontal runs: runs touching vertically are
+        hooked onto the lowest run id, then parents are compressed by pointer
+        jumping, all as whole-array operations. Labels come back as an array."""
+        width = self.width
+        is_open = np.frombuffer(open_cells, dtype=np.uint8).astype(bool)
+        # The border is closed, so runs never wrap from one row to the next.
+        starts = is_open.copy()
+        starts[1:] &= ~is_open[:-1]
+        run_ids = np.cumsum(starts) - 1
+        run_count = int(run_ids[-1]) + 1 if len(run_ids) else 0
+        if run_count == 0:
+            return np.full(len(open_cells), -1), []
+        touching = is_open[:-width] & is_open[width:]
+        upper = run_ids[:-width][touching]
+        lower = run_ids[width:][touching]
+        parents = np.arange(run_count)
+        while True:
+            upper_roots = parents[upper]
+            lower_roots = parents[lower]
+            merge = upper_roots != lower_roots
+            if not merge.any():
+                break
+            np.minimum.at(parents, np.maximum(upper_roots, lower_roots)[merge],
+                          np.minimum(upper_roots, lower_roots)[merge])
+            while True:
+                grandparents = parents[parents]
+                if np.array_equal(grandparents, parents):
+                    break
+                parents = grandparents
+        # Roots are each region's lowest run id, i.e. its first run in scan order.
+        _, run_labels = np.unique(parents, return_inverse=True)
+        labels = np.where(is_open, run_labels[run_ids], -1)
+        sizes = np.bincount(labels[is_open])
+        return labels, sizes.tolist()
+    
+    def connect_regions(self, dungeon: List[List[str]], min_region_size: int = 8):
+        """Make every open tile reachable from every other one.
+        
+        Pockets smaller than ``min_region_size`` are filled with rock; every
+        other region is joined to the largest one by carving the shortest
+        tunnel found by a single breadth-first search from the largest region.
+        The search starts from the largest region's edge cells only and stops
+        as soon as the last region has been reached.
+        """
+        width = self.width
+        if np is not None:
+            labels, sizes = self._label_regions_numpy(self._interior_open_cells(dungeon))
+        else:
+            labels, sizes = self.label_regions(dungeon)
+        if len(sizes) <= 1:
+            return
+        main = sizes.index(max(sizes))
+        
+        small = [label for label, size in enumerate(sizes) if size < min_region_size]
+        for index in self._cells_in_regions(labels, small):
+            dungeon[index // width][index % width] = '#'
+            labels[index] = -1
+        pending = [label for label, size in enumerate(sizes)
+                   if label != main and size >= min_region_size]
+        if not pending:
+            return
+        parents, sources = self._region_sources(labels, main)
+        if np is not None:
+            arrivals = self._first_arrivals_numpy(labels, parents, sources, pending)
+        else:
+            arrivals = self._first_arrivals(labels, parents, sources, pending)
+        for cell in arrivals:
+            step = cell
+            while labels[step] != main:
+                dungeon[step // width][step % width] = '.'
+                labels[step] = main
+                step = parents[step]
+    
+    def _first_arrivals(self, labels: List[int], parents: List[int], sources: List[int],
+                        pending: List[int]) -> List[int]:
+        """Breadth-first search over every interior cell, rock included,
+        filling ``parents``. Returns the first cell reached in each pending
+        region, in search order; stops once all of them are found."""
+        width, height = self.width, self.height
+        waiting = set(pending)
+        arrivals = []
+        queue = deque(sources)
+        while queue and waiting:
+            cell = queue.popleft()
+            label = labels[cell]
+            if label in waiting:
+                waiting.discard(label)
+                arrivals.append(cell)
+            x, y = cell % width, cell // width
+            for neighbour, inside in ((cell - 1, x > 1), (cell + 1, x < width - 2),
+                                      (cell - width, y > 1), (cell + width, y < height - 2)):
+                if inside and parents[neighbour] == -1:
+                    parents[neighbour] = cell
+                    queue.append(neighbour)
+        return arrivals
+    
+    def _first_arrivals_numpy(self, labels, parents, sources, pending: List[int]) -> List[int]:
+        """``_first_arrivals`` one whole BFS level at a time. Each level lists
+        its cells in the order a FIFO queue would hold them, so the parents
+        and the arrivals are exactly the ones the queue would find."""
+        width, height = self.width, self.height
+        interior = np.zeros((height, width), dtype=bool)
+        interior[1:-1, 1:-1] = True
+        unvisited = interior.ravel() & (parents == -1)
+        waiting = np.zeros(max(pending) + 1, dtype=bool)
+        waiting[pending] = True
+        remaining = len(pending)
+        offsets = np.array([-1, 1, -width, width], dtype=np.intp)
+        frontier = np.array(sources, dtype=np.intp)
+        levels = [frontier]
+        while frontier.size and remaining:
+            neighbours = (frontier[:, None] + offsets).ravel()
+            via = np.repeat(frontier, 4)
+            fresh = unvisited[neighbours]
+            neighbours = neighbours[fresh]
+            via = via[fresh]
+            first = np.sort(np.unique(neighbours, return_index=True)[1])
+            frontier = neighbours[first]
+            unvisited[frontier] = False
+            parents[frontier] = via[first]
+            reached = labels[frontier]
+            reached = np.unique(reached[(reached >= 0) & (reached < len(waiting))])
+            reached = reached[waiting[reached]]
+            waiting[reached] = False
+            remaining -= len(reached)
+            levels.append(frontier)
+        order = np.concatenate(levels)
+        order_labels = labels[order]
+        hits = np.flatnonzero(np.isin(order_labels, pending))
+        _, first_hits = np.unique(order_labels[hits], return_index=True)
+        return order[hits[np.sort(first_hits)]].tolist()
+    
+    def _cells_in_regions(self, labels: List[int], regions: List[int]) -> List[int]:
+        if not regions:
+            return []
+        if np is not None:
+            return np.flatnonzero(np.isin(labels, regions)).tolist()
+        regions = set(regions)
+        return [index for index, label in enumerate(labels) if label in regions]
+    
+    def _region_sources(self, labels: List[int], region: int) -> Tuple[List[int], List[int]]:
+        """Search parents with every cell of ``region`` as its own root, and
+        the region's cells that touch another label, in scan order. Interior
+        cells could never reach a new neighbour, so they are not sources."""
+        width = self.width
+        if np is not None:
+            inside = labels == region
+            parents = np.where(inside, np.arange(len(labels)), -1)
+            edge = np.zeros_like(inside)
+            edge[1:-1] = ~(inside[:-2] & inside[2:])
+            edge[width:-width] |= ~(inside[:-2 * width] & inside[2 * width:])
+            return parents, np.flatnonzero(inside & edge)
+        parents = [-1] * len(labels)
+        sources = []
+        for index, label in enumerate(labels):
+            if label == region:
+                parents[index] = index
+                if (labels[index - 1] != region or labels[index + 1] != region or
+                        labels[index - width] != region or labels[index + width] != region):
+                    sources.append(index)
+        return parents, sources
+    
+    def distance_map(self, dungeon, start: Tuple[int, int]) -> array:
+        """Breadth-first walking distance from ``start`` to every tile (-1 if
+        unreachable), as a flat row-major ``array('i')``."""
+        width = self.width
+        open_cells = self._interior_open_cells(dungeon)
+        start_index = start[1] * width + start[0]
+        if np is not None:
+            distances = array('i')
+            distances.frombytes(self._distance_map_numpy(open_cells, start_index).tobytes())
+            return distances
+        distances = array('i', [-1]) * (width * self.height)
+        distances[start_index] = 0
+        open_cells[start_index] = 0
+        frontier = [start_index]
+        distance = 0
+        while frontier:
+            distance += 1
+            next_frontier = []
+            for cell in frontier:
+                for neighbour in (cell - 1, cell + 1, cell - width, cell + width):
+                    if open_cells[neighbour]:
+                        open_cells[neighbour] = 0
+                        distances[neighbour] = distance
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+        return distances
+    
+    def _distance_map_numpy(self, open_cells: bytearray, start_index: int):
+        """The same breadth-first search, one whole frontier per step."""
+        width = self.width
+        unvisited = np.frombuffer(open_cells, dtype=np.uint8).astype(bool)
+        distances = np.full(len(open_cells), -1, dtype=np.intc)
+        owner = np.empty(len(open_cells), dtype=np.intp)
+        distances[start_index] = 0
+        unvisited[start_index] = False
+        offsets = np.array([-1, 1, -width, width], dtype=np.intp)
+        frontier = np.array([start_index], dtype=np.intp)
+        distance = 0
+        while frontier.size:
+            distance += 1
+            neighbours = (frontier[:, None] + offsets).ravel()
+            neighbours = neighbours[unvisited[neighbours]]
+            # A cell reached twice keeps only the copy that wrote it last.
+            order = np.arange(len(neighbours))
+            owner[neighbours] = order
+            frontier = neighbours[owner[neighbours] == order]
+            unvisited[frontier] = False
+            distances[frontier] = distance
+        return distances
+    
+    def relax_distance_map(self, dungeon: TileGrid, distances: array, opened: Tuple[int, int]):
+        """Update ``distances`` in place after the tile ``opened`` became
+        walkable. Distances can only shrink, so the search only visits the
+        cells the new tile brings closer to the start."""
+        width, height = self.width, self.height
+        x, y = opened
+        if not (0 < x < width - 1 and 0 < y < height - 1):
+            return
+        walkable = dungeon.walkable
+        cell = y * width + x
+        reached = [distances[neighbour] for neighbour in (cell - 1, cell + 1, cell - width,
+                                                           cell + width)
+                   if distances[neighbour] >= 0]
+        if not reached:
+            return
+        distances[cell] = min(reached) + 1
+        queue = deque([cell])
+        while queue:
+            cell = queue.popleft()
+            distance = distances[cell] + 1
+            x, y = cell % width, cell // width
+            for neighbour, inside in ((cell - 1, x > 1), (cell + 1, x < width - 2),
+                                      (cell - width, y > 1), (cell + width, y < height - 2)):
+                if (inside and walkable[neighbour] and
+                        not 0 <= distances[neighbour] <= distance):
+                    distances[neighbour] = distance
+                    queue.append(neighbour)
+    
+    def _interior_open_cells(self, dungeon) -> bytearray:
+        """Flat walkable mask with the border forced closed, so flat-index
+        neighbours never wrap around a row."""
+        width, height = self.width, self.height
+        if isinstance(dungeon, TileGrid):
+            cells = bytearray(dungeon.walkable)
+        else:
+            cells = walkable_layer(dungeon)
+        cells[:width] = bytes(width)
+        cells[-width:] = bytes(width)
+        cells[::width] = bytes(height)
+        cells[width - 1::width] = bytes(height)
+        return cells
+    
     def find_valid_positions(self, dungeon: List[List[str]], 
                            count: int = 2) -> List[Tuple[int, int]]:
         floor_tiles = []
@@ -95,4 +475,4 @@ class DungeonGenerator:
                     floor_tiles.append((x, y))
         if len(floor_tiles) < count:
             return floor_tiles
-        return random.sample(floor_tiles, count)
+        return self.rng.sample(floor_tiles, count)
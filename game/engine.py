@@ -0,0 +1,265 @@
+"""Headless game engine for Terminus Veil.
+
+The engine owns the whole dive state and resolves player actions without any
+UI dependency, so the game can be driven by the Textual app, bots, load
+tests or profilers alike.
+"""
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional
+
+from .combat import CombatSystem, GameState
+from .events import Event, EventBus, EventType
+from .game_map import GameMap
+from .items import ItemManager, ItemType
+from .monster import MonsterManager
+from .player import Player
+from .rng import LevelRNG, new_run_seed
+
+
+# Zone names for each depth level
+ZONE_NAMES = {
+    1: "Sunlight Zone",
+    2: "Twilight Zone",
+    3: "Midnight Zone",
+    4: "Abyssal Zone",
+    5: "Hadal Trench"
+}
+
+MOVES = {
+    'move_up': (0, -1),
+    'move_down': (0, 1),
+    'move_left': (-1, 0),
+    'move_right': (1, 0),
+}
+
+
+def get_zone_name(level: int) -> str:
+    """Return the zone name for a given depth level."""
+    return ZONE_NAMES.get(level, f"Depth {level}")
+
+
+class Level:
+    """Everything generated for one depth, ready to be swapped in."""
+    
+    def __init__(self, depth: int, rng: LevelRNG, game_map: GameMap,
+                 monster_manager: MonsterManager, item_manager: ItemManager):
+        self.depth = depth
+        self.rng = rng
+        self.game_map = game_map
+        self.monster_manager = monster_manager
+        self.item_manager = item_manager
+
+
+def build_level(depth: int, width: int, height: int, seed: int,
+                attempt: int = 0, algorithm: str = 'bsp') -> Level:
+    """Generate a map, spawn its creatures and items, and warm its FOV cache.
+    
+    The level is fully determined by ``seed``, ``depth`` and ``attempt``.
+    Safe to run off the UI thread: it only touches the objects it creates.
+    """
+    rng = LevelRNG(seed, depth, attempt)
+    game_map = GameMap(width, height, rng=rng.layout, algorithm=algorithm)
+    game_map.place_exit()
+    
+    game_state = GameState()
+    monster_manager = MonsterManager(rng.combat)
+    item_manager = ItemManager(rng.spawns)
+    monster_manager.spawn_monsters(game_map,
+                                   game_state.get_monster_count_for_level(depth), depth,
+                                   rng.spawns)
+    item_manager.spawn_items(game_map, game_state.get_item_count_for_level(depth))
+    
+    start_x, start_y = game_map.player_start
+    game_map.fov_calculator.calculate(start_x, start_y, GameMap.fov_radius(depth),
+                                      game_map.fov_algorithm)
+    return Level(depth, rng, game_map, monster_manager, item_manager)
+
+
+class Engine:
+    """Owns the map, diver, creatures, items and combat for one dive.
+    
+    While a depth is being played, the next one is generated speculatively on
+    a worker thread so descending only has to swap it in. All randomness comes
+    from streams derived from ``seed``, so a seed reproduces the whole dive.
+    Every event ``perform`` returns is also published on ``events``, after an
+    ``ACTION`` event naming the action itself. With an
+    ``autosave_path`` the dive is saved in the background at every descent;
+    ``level`` and ``game_state`` resume a dive (see ``game.save``).
+    """
+    
+    ACTIONS = ('move_up', 'move_down', 'move_left', 'move_right',
+               'use_item', 'use_oxygentank', 'use_flare', 'restart')
+    
+    def __init__(self, map_width: int = 80, map_height: int = 40,
+                 pregenerate: bool = True, seed: Optional[int] = None,
+                 map_algorithm: str = 'bsp', autosave_path: Optional[str] = None,
+                 level: Optional[Level] = None, game_state: Optional[GameState] = None):
+        self.map_width = map_width
+        self.map_height = map_height
+        self.map_algorithm = map_algorithm
+        self.seed = seed if seed is not None else new_run_seed()
+        self.restarts = 0   # restarts of the current depth
+        self.combat_system = CombatSystem()
+        self.events = EventBus()
+        self.game_state = game_state if game_state is not None else GameState()
+        self.player = Player(0, 0)
+        self.transition_times: List[float] = []   # milliseconds per descent
+        self.autosave_path = autosave_path
+        self._executor = ThreadPoolExecutor(max_workers=1) if pregenerate else None
+        self._saver: Optional[ThreadPoolExecutor] = None
+        self._last_save: Optional[Future] = None
+        self._next_level: Optional[Future] = None
+        if level is None:
+            level = self._generate(self.game_state.current_level)
+        self._enter_level(level)
+        self._pregenerate_next()
+    
+    def close(self):
+        """Stop the background generator and finish any pending save."""
+        if self._next_level is not None:
+            self._next_level.cancel()
+            self._next_level = None
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._saver:
+            self._saver.shutdown(wait=True)
+            self._saver = None
+    
+    def autosave(self) -> Optional[Future]:
+        """Snapshot the dive now and write it to ``autosave_path`` on a
+        worker thread; only the in-memory copy happens on this thread."""
+        if not self.autosave_path:
+            return None
+        from .save import capture, write_capture
+        
+        if self._saver is None:
+            self._saver = ThreadPoolExecutor(max_workers=1)
+        self._last_save = self._saver.submit(write_capture, self.autosave_path, capture(self))
+        return self._last_save
+    
+    def _generate(self, depth: int, attempt: int = 0) -> Level:
+        return build_level(depth, self.map_width, self.map_height, self.seed, attempt,
+                           self.map_algorithm)
+    
+    def _pregenerate_next(self):
+        if self._executor:
+            self._next_level = self._executor.submit(
+                self._generate, self.game_state.current_level + 1
+            )
+    
+    def _take_next_level(self) -> Level:
+        depth = self.game_state.current_level
+        future, self._next_level = self._next_level, None
+        if future is not None:
+            level = future.result()
+            if level.depth == depth:
+                return level
+        return self._generate(depth)
+    
+    def _enter_level(self, level: Level):
+        """Swap a generated level in and place the diver at its start."""
+        self.game_map = level.game_map
+        self.monster_manager = level.monster_manager
+        self.item_manager = level.item_manager
+        self.level_rng = level.rng
+        self.combat_system.rng = level.rng.combat
+        self.player.x, self.player.y = self.game_map.player_start
+        self.update_fov()
+    
+    def update_fov(self):
+        self.game_map.update_fov(self.player.x, self.player.y, self.game_state.current_level)
+    
+    def perform(self, action: str) -> List[Event]:
+        """Resolve one named action (see ACTIONS) and return its events."""
+        if action in MOVES:
+            events = self.move(*MOVES[action])
+        elif action in ('use_item', 'use_oxygentank'):
+            events = self.use_item(ItemType.OXYGEN_TANK)
+        elif action == 'use_flare':
+            events = self.use_item(ItemType.SIGNAL_FLARE)
+        elif action == 'restart':
+            events = self.restart()
+        else:
+            raise ValueError(f"Unknown action: {action}")
+        self.update_fov()
+        self.events.publish(Event(EventType.ACTION, action=action))
+        for event in events:
+            self.events.publish(event)
+        return events
+    
+    def move(self, dx: int, dy: int) -> List[Event]:
+        """Move the diver, attacking any creature in the way."""
+        events = []
+        if self.game_state.game_over:
+            return events
+        
+        player = self.player
+        new_x = player.x + dx
+        new_y = player.y + dy
+        target_monster = self.monster_manager.get_monster_at(new_x, new_y)
+        
+        if target_monster and target_monster.is_alive:
+            events.extend(self.combat_system.player_attack_monster(player, target_monster))
+            events.extend(self._process_turn())
+        elif player.move(dx, dy, self.game_map.tiles):
+            events.append(Event(EventType.MOVE))
+            item = self.item_manager.collect_item(player.x, player.y)
+            if item:
+                events.append(Event(EventType.PICKUP, player.inventory.add_item(item)))
+            
+            if self.game_state.check_victory_condition(player.x, player.y,
+                                                       self.game_map.tiles):
+                events.extend(self._advance_to_next_level())
+                return events
+            
+            events.extend(self._process_turn())
+        else:
+            events.append(Event(EventType.BLOCKED))
+        
+        if self.game_state.check_defeat_condition(player):
+            events.append(Event(EventType.DEFEAT, "Oxygen depleted! Mission failed."))
+        return events
+    
+    def _process_turn(self) -> List[Event]:
+        return self.combat_system.process_turn(
+            self.player, self.monster_manager, self.game_map.tiles,
+            self.game_map.visibility_tracker
+        )
+    
+    def _advance_to_next_level(self) -> List[Event]:
+        """Descend to the next depth."""
+        start = time.perf_counter()
+        self.game_state.advance_level()
+        self.restarts = 0
+        self._enter_level(self._take_next_level())
+        self._pregenerate_next()
+        self.autosave()
+        self.transition_times.append((time.perf_counter() - start) * 1000)
+        
+        zone = get_zone_name(self.game_state.current_level)
+        return [Event(EventType.DESCEND, "You descend into the {zone}!", zone=zone),
+                Event(EventType.DESCEND, "The pressure increases...")]
+    
+    def restart(self) -> List[Event]:
+        """Restart the current depth on a new map with full oxygen."""
+        self.player.hp = self.player.max_hp
+        self.game_state.game_over = False
+        self.game_state.victory = False
+        self.restarts += 1
+        self._enter_level(self._generate(self.game_state.current_level, self.restarts))
+        
+        self.events.clear()
+        return [Event(EventType.RESTART, "Return to the {zone}.",
+                      zone=get_zone_name(self.game_state.current_level))]
+    
+    def use_item(self, item_type: ItemType) -> List[Event]:
+        result = self.player.inventory.use_item(item_type, self.player,
+                                                self.combat_system.rng)
+        if result:
+            return [Event(EventType.ITEM_USED, result)]
+        
+        return [Event(EventType.MESSAGE, "No {name}s available!",
+                      name=item_type.value[1].lower())]
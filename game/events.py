@@ -0,0 +1,78 @@
+"""Game events emitted by the engine for Terminus Veil."""
+
+from collections import deque
+from enum import Enum
+from itertools import islice
+from typing import Callable, Deque, List
+
+
+class EventType(Enum):
+    """Kinds of things that can happen during a turn."""
+    ACTION = "action"       # the named action a turn resolved, see Engine.ACTIONS
+    MOVE = "move"
+    CREATURE_MOVE = "creature_move"
+    BLOCKED = "blocked"
+    ATTACK = "attack"
+    DAMAGE = "damage"
+    DEATH = "death"
+    PICKUP = "pickup"
+    ITEM_USED = "item_used"
+    MESSAGE = "message"
+    DESCEND = "descend"
+    DEFEAT = "defeat"
+    RESTART = "restart"
+
+
+class Event:
+    """Something that happened as the result of an action.
+    
+    When keyword fields are given, ``message`` is a ``str.format`` template
+    that is only filled in the first time the text is read.
+    """
+    
+    def __init__(self, event_type: EventType, message: str = "", **fields):
+        self.event_type = event_type
+        self.template = message
+        self.fields = fields
+        self._message = None if fields else message
+    
+    @property
+    def message(self) -> str:
+        if self._message is None:
+            self._message = self.template.format(**self.fields)
+        return self._message
+    
+    def __repr__(self) -> str:
+        return f"Event({self.event_type.name}, {self.message!r})"
+
+
+class EventBus:
+    """Delivers every event to subscribers and keeps a combat log.
+    
+    The log is a ring buffer of the last ``capacity`` events that carry
+    text; nothing is formatted until ``recent_messages`` is called.
+    """
+    
+    def __init__(self, capacity: int = 10):
+        self.log: Deque[Event] = deque(maxlen=capacity)
+        self._subscribers: List[Callable[[Event], None]] = []
+    
+    def subscribe(self, callback: Callable[[Event], None]) -> Callable[[Event], None]:
+        self._subscribers.append(callback)
+        return callback
+    
+    def unsubscribe(self, callback: Callable[[Event], None]):
+        self._subscribers.remove(callback)
+    
+    def publish(self, event: Event):
+        if event.template:
+            self.log.append(event)
+        for callback in self._subscribers:
+            callback(event)
+    
+    def recent_messages(self, count: int = 5) -> List[str]:
+        events = list(islice(reversed(self.log), count))
+        return [event.message for event in reversed(events)]
+    
+    def clear(self):
+        self.log.clear()
@@ -1,16 +1,69 @@
-"""Field of View system (unchanged logic)."""
+"""Field of View system."""
 
 import math
-from typing import Set, Tuple, List
+from collections import OrderedDict
+from typing import FrozenSet, Iterable, List, Optional, Set, Tuple
+from .tiles import TileGrid
+
+
+# (xx, xy, yx, yy) transforms from quadrant-local (col, depth) to map offsets:
+# north, south, east, west.
+_QUADRANTS = (
+    (1, 0, 0, -1),
+    (1, 0, 0, 1),
+    (0, 1, 1, 0),
+    (0, -1, 1, 0),
+)
 
 
 class FOVCalculator:
     """Calculates field of view using shadowcasting."""
     
-    def __init__(self, game_map: List[List[str]]):
+    ALGORITHMS = {
+        'shadowcast': 'calculate_shadowcast_fov',
+        'simple': 'calculate_simple_fov',
+        'rays': 'calculate_fov',
+    }
+    
+    def __init__(self, game_map: TileGrid, cache_size: int = 256):
         self.game_map = game_map
-        self.width = len(game_map[0]) if game_map else 0
-        self.height = len(game_map)
+        self.opaque = game_map.opaque
+        self.width = game_map.width
+        self.height = game_map.height
+        self.map_version = 0
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache: "OrderedDict[tuple, FrozenSet[Tuple[int, int]]]" = OrderedDict()
+    
+    def calculate(self, player_x: int, player_y: int, radius: int = 8,
+                  algorithm: str = 'shadowcast') -> FrozenSet[Tuple[int, int]]:
+        """Dispatch to one of the FOV algorithms listed in ALGORITHMS.
+        
+        Results are memoized in a bounded LRU cache keyed on position, radius,
+        algorithm and ``map_version``; call ``invalidate`` after changing tiles.
+        """
+        key = (player_x, player_y, radius, algorithm, self.map_version)
+        cache = self._cache
+        visible = cache.get(key)
+        if visible is not None:
+            cache.move_to_end(key)
+            self.cache_hits += 1
+            return visible
+        method = self.ALGORITHMS.get(algorithm)
+        if method is None:
+            raise ValueError(f"Unknown FOV algorithm: {algorithm}")
+        self.cache_misses += 1
+        visible = frozenset(getattr(self, method)(player_x, player_y, radius))
+        cache[key] = visible
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return visible
+    
+    def invalidate(self):
+        """Mark the map as changed so cached results are never reused."""
+        self.map_version += 1
+        self._cache.clear()
     
     def calculate_fov(self, player_x: int, player_y: int, 
                       radius: int = 8) -> Set[Tuple[int, int]]:
@@ -33,9 +86,63 @@ class FOVCalculator:
             if not (0 <= x < self.width and 0 <= y < self.height):
                 break
             visible.add((x, y))
-            if self.game_map[y][x] == '#':
+            if self.opaque[y * self.width + x]:
                 break
     
+    def calculate_shadowcast_fov(self, player_x: int, player_y: int,
+                                 radius: int = 8) -> Set[Tuple[int, int]]:
+        """Symmetric recursive shadowcasting.
+        
+        Each quadrant is scanned row by row, so every cell is visited at most
+        once per quadrant. Floor tiles are only revealed when their centre lies
+        inside the lit sector, which makes the result symmetric: if the diver
+        can see a floor tile, a creature standing there can see the diver.
+        Walls that bound the lit sector are included too, so they get explored
+        and the renderer can draw them; they are drawn as walls, not floor.
+        Slopes are kept as integer fractions to avoid float rounding.
+        """
+        visible = {(player_x, player_y)}
+        radius_sq = radius * radius
+        for transform in _QUADRANTS:
+            self._scan_row(player_x, player_y, transform, 1, -1, 1, 1, 1,
+                           radius, radius_sq, visible)
+        return visible
+    
+    def _scan_row(self, origin_x: int, origin_y: int,
+                  transform: Tuple[int, int, int, int], depth: int,
+                  start_num: int, start_den: int, end_num: int, end_den: int,
+                  radius: int, radius_sq: int, visible: Set[Tuple[int, int]]):
+        if depth > radius:
+            return
+        xx, xy, yx, yy = transform
+        opaque = self.opaque
+        width, height = self.width, self.height
+        # round_ties_up(depth * start) .. round_ties_down(depth * end)
+        min_col = (2 * depth * start_num + start_den) // (2 * start_den)
+        max_col = -((end_den - 2 * depth * end_num) // (2 * end_den))
+        depth_sq = depth * depth
+        prev_wall = None
+        for col in range(min_col, max_col + 1):
+            x = origin_x + col * xx + depth * xy
+            y = origin_y + col * yx + depth * yy
+            in_bounds = 0 <= x < width and 0 <= y < height
+            is_wall = not in_bounds or opaque[y * width + x] == 1
+            if in_bounds and col * col + depth_sq <= radius_sq and (
+                    is_wall or (col * start_den >= depth * start_num and
+                                col * end_den <= depth * end_num)):
+                visible.add((x, y))
+            if prev_wall and not is_wall:
+                start_num, start_den = 2 * col - 1, 2 * depth
+            elif prev_wall is False and is_wall:
+                self._scan_row(origin_x, origin_y, transform, depth + 1,
+                               start_num, start_den, 2 * col - 1, 2 * depth,
+                               radius, radius_sq, visible)
+            prev_wall = is_wall
+        if prev_wall is False:
+            self._scan_row(origin_x, origin_y, transform, depth + 1,
+                           start_num, start_den, end_num, end_den,
+                           radius, radius_sq, visible)
+    
     def calculate_simple_fov(self, player_x: int, player_y: int, 
                            radius: int = 8) -> Set[Tuple[int, int]]:
         visible = set()
@@ -56,7 +163,7 @@ class FOVCalculator:
         y_inc = 1 if y1 < y2 else -1
         error = dx - dy
         while True:
-            if (x, y) != (x1, y1) and self.game_map[y][x] == '#':
+            if (x, y) != (x1, y1) and self.opaque[y * self.width + x]:
                 return False
             if x == x2 and y == y2:
                 break
@@ -71,18 +178,119 @@ class FOVCalculator:
 
 
 class VisibilityTracker:
-    """Tracks explored vs visible areas."""
+    """Tracks explored vs visible areas.
+    
+    Both layers are flat row-major bytearrays sized to the map, one byte per
+    cell, so ``is_visible``/``is_explored`` never allocate. Without
+    dimensions the layers start empty and grow to fit the cells they are
+    given. Each update also records the cells that were explored for the
+    first time in ``newly_explored``. Once a consumer has called
+    ``drain_newly_explored``, they also accumulate for its next call;
+    before that nothing is queued, so headless runs keep no backlog.
+    """
+    
+    def __init__(self, width: Optional[int] = None, height: Optional[int] = None):
+        self.grows = width is None or height is None
+        self.width = width or 0
+        self.height = height or 0
+        self.visible_grid = bytearray(self.width * self.height)
+        self.explored_grid = bytearray(self.width * self.height)
+        self.newly_explored: List[Tuple[int, int]] = []
+        self.visible_indices: List[int] = []
+        self._pending_explored: Optional[List[Tuple[int, int]]] = None
+    
+    def update_visibility(self, new_visible: Iterable[Tuple[int, int]]):
+        if self.grows:
+            new_visible = list(new_visible)
+            self._fit(new_visible)
+        width, height = self.width, self.height
+        visible = self.visible_grid
+        for index in self.visible_indices:
+            visible[index] = 0
+        indices = []
+        for x, y in new_visible:
+            if 0 <= x < width and 0 <= y < height:
+                index = y * width + x
+                visible[index] = 1
+                indices.append(index)
+        self.visible_indices = indices
+        self.newly_explored = self._explore(indices)
+        if self._pending_explored is not None:
+            self._pending_explored.extend(self.newly_explored)
     
-    def __init__(self):
-        self.explored: Set[Tuple[int, int]] = set()
-        self.visible: Set[Tuple[int, int]] = set()
+    def _explore(self, indices: List[int]) -> List[Tuple[int, int]]:
+        """Merge the visible layer into the explored one and return the cells
+        that were new, in scan order.
+        
+        The span the view covers is diffed as two big integers, one byte per
+        cell, instead of testing each visible cell on its own.
+        """
+        if not indices:
+            return []
+        width = self.width
+        start, stop = min(indices), max(indices) + 1
+        seen = int.from_bytes(self.visible_grid[start:stop], 'little')
+        known = int.from_bytes(self.explored_grid[start:stop], 'little')
+        fresh = (seen & ~known).to_bytes(stop - start, 'little')
+        self.explored_grid[start:stop] = (seen | known).to_bytes(stop - start, 'little')
+        cells = []
+        offset = fresh.find(1)
+        while offset != -1:
+            index = start + offset
+            cells.append((index % width, index // width))
+            offset = fresh.find(1, offset + 1)
+        return cells
     
-    def update_visibility(self, new_visible: Set[Tuple[int, int]]):
-        self.visible = new_visible
-        self.explored.update(new_visible)
+    def _fit(self, cells: List[Tuple[int, int]]):
+        """Grow the layers of a tracker without dimensions to cover ``cells``."""
+        width = max([self.width] + [x + 1 for x, y in cells if y >= 0])
+        height = max([self.height] + [y + 1 for x, y in cells if x >= 0])
+        if (width, height) == (self.width, self.height):
+            return
+        old_width = self.width
+        for name in ('visible_grid', 'explored_grid'):
+            old = getattr(self, name)
+            layer = bytearray(width * height)
+            for y in range(self.height):
+                layer[y * width:y * width + old_width] = old[y * old_width:(y + 1) * old_width]
+            setattr(self, name, layer)
+        self.visible_indices = [index // old_width * width + index % old_width
+                                for index in self.visible_indices]
+        self.width, self.height = width, height
+    
+    def drain_newly_explored(self) -> List[Tuple[int, int]]:
+        """Return every cell explored since the previous drain. The first
+        call only starts the queue and returns an empty list."""
+        pending = self._pending_explored
+        self._pending_explored = []
+        return pending or []
     
     def is_visible(self, x: int, y: int) -> bool:
-        return (x, y) in self.visible
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.visible_grid[y * self.width + x] == 1
+        return False
     
     def is_explored(self, x: int, y: int) -> bool:
-        return (x, y) in self.explored
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.explored_grid[y * self.width + x] == 1
+        return False
+    
+    @property
+    def visible(self) -> Set[Tuple[int, int]]:
+        """Currently visible cells as a set (compatibility view)."""
+        width = self.width
+        return {(index % width, index // width) for index in self.visible_indices}
+    
+    @property
+    def explored(self) -> Set[Tuple[int, int]]:
+        """Explored cells as a set (compatibility view)."""
+        return self._layer_to_set(self.explored_grid)
+    
+    def _layer_to_set(self, layer: bytearray) -> Set[Tuple[int, int]]:
+        width = self.width
+        cells = set()
+        index = layer.find(1)
+        while index != -1:
+            cells.add((index % width, index // width))
+            index = layer.find(1, index + 1)
+        return cells
@@ -1,32 +1,140 @@
 """Game map system for Terminus Veil."""
 
-from typing import List, Tuple, Optional
+import random
+from array import array
+from typing import Dict, List, Set, Tuple, Optional
 from .dungeon_generator import DungeonGenerator
 from .fov import FOVCalculator, VisibilityTracker
-from .ascii_art import WallRenderer, ASCIIChars, ColorScheme, get_colored_char
+from .ascii_art import WallRenderer
+from .renderer import Cell, MapRenderer
+from .tiles import FLOOR, TileGrid
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; indexing falls back to list scans
+    np = None
+
+
+# Creatures never spawn closer than this many steps to the diver's start,
+# nor closer than MONSTER_SPAWN_SPACING tiles to each other.
+MONSTER_SPAWN_DISTANCE = 6
+MONSTER_SPAWN_SPACING = 3
 
 
 class GameMap:
-    """Represents the underwater cave map."""
+    """Represents the underwater cave map.
+    
+    Procedural maps are repaired so every open tile is reachable, and a BFS
+    distance map from the diver's start (``distance_from_start``, a flat
+    ``array('i')``) is kept for exit placement and spawn spacing. Opening a
+    tile only relaxes the distances it shortens. Open floor tiles are indexed once in
+    ``floor_tiles`` as flat cell indices; spawns sample from it and reserve
+    the cells they take. ``set_tile`` keeps it current in O(1) through a
+    map-sized slot array and swap-remove. Tiles live in a ``TileGrid`` with walkable and opaque layers.
+    """
     
-    def __init__(self, width: int = 80, height: int = 40, use_procedural: bool = True):
+    def __init__(self, width: int = 80, height: int = 40, use_procedural: bool = True,
+                 rng: Optional[random.Random] = None, algorithm: str = 'bsp'):
         self.width = width
         self.height = height
+        self.rng = rng if rng is not None else random
+        self.algorithm = algorithm
         self.use_procedural = use_procedural
+        self.fov_algorithm = 'shadowcast'
+        self.generator = DungeonGenerator(width, height, self.rng)
+        self.reserved: Set[Tuple[int, int]] = set()
         
         if use_procedural:
-            self.tiles = self._generate_procedural_map()
+            self._attach(TileGrid(self._generate_procedural_map()))
         else:
-            self.tiles = self._create_simple_map()
-        
-        self.fov_calculator = FOVCalculator(self.tiles)
-        self.visibility_tracker = VisibilityTracker()
-        self.wall_renderer = WallRenderer(self.tiles)
+            self._attach(TileGrid(self._create_simple_map()))
         self.player_start, self.exit_pos = self._find_special_positions()
     
+    @classmethod
+    def from_grid(cls, tiles: TileGrid, player_start: Tuple[int, int],
+                  exit_pos: Tuple[int, int], distance_from_start: array,
+                  rng: Optional[random.Random] = None, algorithm: str = 'bsp') -> "GameMap":
+        """Rebuild a map around saved tiles without generating or searching;
+        ``floor_tiles`` is only indexed if something asks for it."""
+        game_map = cls.__new__(cls)
+        game_map.width = tiles.width
+        game_map.height = tiles.height
+        game_map.rng = rng if rng is not None else random
+        game_map.algorithm = algorithm
+        game_map.use_procedural = True
+        game_map.fov_algorithm = 'shadowcast'
+        game_map.generator = DungeonGenerator(tiles.width, tiles.height, game_map.rng)
+        game_map.reserved = set()
+        game_map._attach(tiles)
+        game_map._floor_tiles = None
+        game_map._floor_slots = None
+        game_map.player_start = player_start
+        game_map.exit_pos = exit_pos
+        game_map.distance_from_start = distance_from_start
+        return game_map
+    
+    def _attach(self, tiles: TileGrid):
+        self.tiles = tiles
+        self.fov_calculator = FOVCalculator(tiles)
+        self.visibility_tracker = VisibilityTracker(self.width, self.height)
+        self.wall_renderer = WallRenderer(tiles)
+        self.renderer = MapRenderer(self)
+    
+    @property
+    def floor_tiles(self) -> array:
+        """Flat indices (``y * width + x``) of the floor tiles."""
+        if self._floor_tiles is None:
+            self._floor_tiles = self._index_floor()
+        return self._floor_tiles
+    
+    def _floor_index(self) -> array:
+        """Cell -> slot in ``floor_tiles`` (-1 if absent), sized to the map and
+        built the first time a tile changes."""
+        if self._floor_slots is None:
+            floor = self.floor_tiles
+            slots = array('i', [-1]) * (self.width * self.height)
+            if np is not None:
+                np.frombuffer(slots, dtype=np.intc)[np.frombuffer(floor, dtype=np.intc)] = \
+                    np.arange(len(floor), dtype=np.intc)
+            else:
+                for slot, cell in enumerate(floor):
+                    slots[cell] = slot
+            self._floor_slots = slots
+        return self._floor_slots
+    
+    def _add_floor(self, cell: int):
+        slots = self._floor_index()
+        if slots[cell] < 0:
+            slots[cell] = len(self.floor_tiles)
+            self.floor_tiles.append(cell)
+    
+    def _remove_floor(self, cell: int):
+        """Drop a tile from ``floor_tiles`` by moving the last entry into its slot."""
+        slots = self._floor_index()
+        slot = slots[cell]
+        if slot < 0:
+            return
+        slots[cell] = -1
+        floor = self.floor_tiles
+        last = floor.pop()
+        if slot < len(floor):
+            floor[slot] = last
+            slots[last] = slot
+    
+    def _index_floor(self) -> array:
+        floor_code = FLOOR.code
+        cells = array('i')
+        if np is not None:
+            codes = np.frombuffer(self.tiles.codes, dtype=np.uint8)
+            cells.frombytes(np.flatnonzero(codes == floor_code).astype(np.intc).tobytes())
+            return cells
+        cells.extend(index for index, code in enumerate(self.tiles.codes) if code == floor_code)
+        return cells
+    
     def _generate_procedural_map(self) -> List[List[str]]:
-        generator = DungeonGenerator(self.width, self.height)
-        return generator.generate_bsp_dungeon()
+        tiles = self.generator.generate(self.algorithm)
+        self.generator.connect_regions(tiles)
+        return tiles
     
     def _create_simple_map(self) -> List[List[str]]:
         map_data = []
@@ -48,119 +156,140 @@ class GameMap:
         return map_data
     
     def _find_special_positions(self) -> Tuple[Tuple[int, int], Tuple[int, int]]:
-        generator = DungeonGenerator(self.width, self.height)
-        positions = generator.find_valid_positions(self.tiles, 2)
-        if len(positions) >= 2:
-            return positions[0], positions[1]
-        elif len(positions) == 1:
-            return positions[0], positions[0]
-        else:
+        """Index the floor, pick the diver's start, then an exit in the farther
+        half of the map. Both cells are reserved."""
+        self._floor_tiles = self._index_floor()
+        self._floor_slots = None
+        if not self.floor_tiles:
+            self.distance_from_start = array('i', [-1]) * (self.width * self.height)
             return (self.width // 2, self.height // 2), (self.width // 2 + 1, self.height // 2)
+        
+        start_index = self.rng.choice(self.floor_tiles)
+        start = (start_index % self.width, start_index // self.width)
+        self.distance_from_start = self.generator.distance_map(self.tiles, start)
+        self.reserved.add(start)
+        if np is not None:
+            distances = np.frombuffer(self.distance_from_start, dtype=np.intc)
+            farthest = int(distances.max())
+            candidates = np.flatnonzero(distances >= (farthest + 1) // 2).tolist()
+        else:
+            farthest = max(self.distance_from_start)
+            candidates = [index for index, distance in enumerate(self.distance_from_start)
+                          if distance >= (farthest + 1) // 2]
+        if farthest <= 0:
+            return start, start
+        exit_index = self.rng.choice(candidates)
+        exit_pos = (exit_index % self.width, exit_index // self.width)
+        self.reserved.add(exit_pos)
+        return start, exit_pos
+    
+    def distance_to_start(self, x: int, y: int) -> int:
+        """Walking distance from the diver's start, or -1 if unreachable."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.distance_from_start[y * self.width + x]
+        return -1
+    
+    def reserve_positions(self, count: int, rng: Optional[random.Random] = None,
+                          min_start_distance: int = 1,
+                          min_spacing: int = 0) -> List[Tuple[int, int]]:
+        """Draw up to ``count`` free floor tiles and mark them reserved.
+        
+        Tiles are rejection-sampled from ``floor_tiles``, so the cost scales
+        with ``count`` rather than the map area. Picks must be at least
+        ``min_start_distance`` steps from the start and, when ``min_spacing``
+        is set, that many tiles (Chebyshev) from each other, checked against a
+        bucket grid as in Poisson-disk sampling. If sampling keeps failing,
+        the remaining floor is scanned once in random order.
+        """
+        rng = rng if rng is not None else self.rng
+        width = self.width
+        floor = self.floor_tiles
+        codes = self.tiles.codes
+        picked: List[Tuple[int, int]] = []
+        if not floor or count <= 0:
+            return picked
+        buckets: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        bucket_size = max(1, min_spacing)
+        
+        def accept(cell: int) -> bool:
+            position = x, y = cell % width, cell // width
+            if (position in self.reserved or codes[cell] != FLOOR.code or
+                    self.distance_from_start[cell] < min_start_distance):
+                return False
+            if min_spacing:
+                bx, by = x // bucket_size, y // bucket_size
+                for ny in (by - 1, by, by + 1):
+                    for nx in (bx - 1, bx, bx + 1):
+                        for other_x, other_y in buckets.get((nx, ny), ()):
+                            if max(abs(other_x - x), abs(other_y - y)) < min_spacing:
+                                return False
+                buckets.setdefault((bx, by), []).append(position)
+            self.reserved.add(position)
+            picked.append(position)
+            return True
+        
+        attempts = count * 30
+        while len(picked) < count and attempts > 0:
+            attempts -= 1
+            accept(floor[rng.randrange(len(floor))])
+        if len(picked) < count:
+            for cell in rng.sample(floor, len(floor)):
+                if accept(cell) and len(picked) >= count:
+                    break
+        return picked
     
     def place_exit(self):
         if self.exit_pos:
             x, y = self.exit_pos
-            if 0 <= x < self.width and 0 <= y < self.height:
-                self.tiles[y][x] = '>'
+            self.set_tile(x, y, '>')
     
-    def get_tile(self, x: int, y: int) -> str:
+    def set_tile(self, x: int, y: int, tile: str):
+        """Change a tile and refresh the layers derived from the grid."""
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.tiles[y][x]
-        return '#'
+            was_walkable = self.tiles.is_walkable(x, y)
+            self.tiles.set(x, y, tile)
+            if not was_walkable and self.tiles.is_walkable(x, y):
+                self.generator.relax_distance_map(self.tiles, self.distance_from_start, (x, y))
+                self._add_floor(y * self.width + x)
+            elif was_walkable and not self.tiles.is_walkable(x, y):
+                if self.distance_from_start[y * self.width + x] >= 0:
+                    self.distance_from_start = self.generator.distance_map(self.tiles,
+                                                                           self.player_start)
+                self._remove_floor(y * self.width + x)
+            self.wall_renderer.refresh(x, y)
+            self.renderer.mark_dirty(x, y)
+            self.fov_calculator.invalidate()
+    
+    def get_tile(self, x: int, y: int) -> str:
+        return self.tiles.get(x, y)
     
     def is_walkable(self, x: int, y: int) -> bool:
-        tile = self.get_tile(x, y)
-        return tile in ['.', '>']
+        return self.tiles.is_walkable(x, y)
     
-    def update_fov(self, player_x: int, player_y: int, level: int = 1):
-        """Update FOV with radius that decreases with depth (simulate darkness)."""
-        base_radius = 8
-        radius = max(5, base_radius - (level - 1))   # reduces by 1 each level, min 5
-        visible_tiles = self.fov_calculator.calculate_simple_fov(player_x, player_y, radius)
+    def update_fov(self, player_x: int, player_y: int, level: int = 1,
+                   algorithm: Optional[str] = None):
+        """Update FOV with radius that decreases with depth (simulate darkness).
+        
+        ``algorithm`` selects an entry of ``FOVCalculator.ALGORITHMS`` and
+        defaults to ``self.fov_algorithm``.
+        """
+        visible_tiles = self.fov_calculator.calculate(
+            player_x, player_y, self.fov_radius(level), algorithm or self.fov_algorithm
+        )
         self.visibility_tracker.update_visibility(visible_tiles)
     
+    @staticmethod
+    def fov_radius(level: int) -> int:
+        base_radius = 8
+        return max(5, base_radius - (level - 1))   # reduces by 1 each level, min 5
+    
     def render_with_entities(self, player_x: int, player_y: int, 
                            monster_manager=None, item_manager=None) -> str:
-        lines = []
-        for y in range(self.height):
-            line = ""
-            for x in range(self.width):
-                if x == player_x and y == player_y:
-                    line += get_colored_char(ASCIIChars.PLAYER, ColorScheme.PLAYER)
-                elif (monster_manager and 
-                      self.visibility_tracker.is_visible(x, y)):
-                    monster = monster_manager.get_monster_at(x, y)
-                    if monster:
-                        if monster.is_alive:
-                            # Map monster type to correct color
-                            if monster.monster_type.name == 'JELLYFISH':
-                                line += get_colored_char(monster.symbol, ColorScheme.JELLYFISH)
-                            elif monster.monster_type.name == 'ANGLERFISH':
-                                line += get_colored_char(monster.symbol, ColorScheme.ANGLERFISH)
-                            elif monster.monster_type.name == 'LEVIATHAN':
-                                line += get_colored_char(monster.symbol, ColorScheme.LEVIATHAN)
-                            else:
-                                line += monster.symbol
-                        else:
-                            line += get_colored_char(monster.symbol, ColorScheme.CORPSE)
-                    elif item_manager:
-                        item = item_manager.get_item_at(x, y)
-                        if item:
-                            if item.item_type.name == 'OXYGEN_TANK':
-                                line += get_colored_char(item.symbol, ColorScheme.OXYGEN_TANK)
-                            elif item.item_type.name == 'RESEARCH_DATA':
-                                line += get_colored_char(item.symbol, ColorScheme.RESEARCH_DATA)
-                            elif item.item_type.name == 'SIGNAL_FLARE':
-                                line += get_colored_char(item.symbol, ColorScheme.SIGNAL_FLARE)
-                            elif item.item_type.name == 'HARPOON_UPGRADE':
-                                line += get_colored_char(item.symbol, ColorScheme.HARPOON_UPGRADE)
-                            else:
-                                line += item.symbol
-                        else:
-                            if self.tiles[y][x] == '>':
-                                line += get_colored_char(ASCIIChars.EXIT, ColorScheme.EXIT)
-                            else:
-                                line += get_colored_char(ASCIIChars.FLOOR, ColorScheme.FLOOR)
-                    else:
-                        if self.tiles[y][x] == '>':
-                            line += get_colored_char(ASCIIChars.EXIT, ColorScheme.EXIT)
-                        else:
-                            line += get_colored_char(ASCIIChars.FLOOR, ColorScheme.FLOOR)
-                elif self.visibility_tracker.is_visible(x, y):
-                    if item_manager:
-                        item = item_manager.get_item_at(x, y)
-                        if item:
-                            if item.item_type.name == 'OXYGEN_TANK':
-                                line += get_colored_char(item.symbol, ColorScheme.OXYGEN_TANK)
-                            elif item.item_type.name == 'RESEARCH_DATA':
-                                line += get_colored_char(item.symbol, ColorScheme.RESEARCH_DATA)
-                            elif item.item_type.name == 'SIGNAL_FLARE':
-                                line += get_colored_char(item.symbol, ColorScheme.SIGNAL_FLARE)
-                            elif item.item_type.name == 'HARPOON_UPGRADE':
-                                line += get_colored_char(item.symbol, ColorScheme.HARPOON_UPGRADE)
-                            else:
-                                line += item.symbol
-                        else:
-                            if self.tiles[y][x] == '>':
-                                line += get_colored_char(ASCIIChars.EXIT, ColorScheme.EXIT)
-                            else:
-                                line += get_colored_char(ASCIIChars.FLOOR, ColorScheme.FLOOR)
-                    else:
-                        if self.tiles[y][x] == '>':
-                            line += get_colored_char(ASCIIChars.EXIT, ColorScheme.EXIT)
-                        else:
-                            line += get_colored_char(ASCIIChars.FLOOR, ColorScheme.FLOOR)
-                elif self.visibility_tracker.is_explored(x, y) or self.tiles[y][x] == '#':
-                    tile = self.tiles[y][x]
-                    if tile == '#':
-                        wall_char = self.wall_renderer.get_wall_char(x, y)
-                        if self.visibility_tracker.is_explored(x, y):
-                            line += get_colored_char(wall_char, ColorScheme.WALL)
-                        else:
-                            line += get_colored_char(wall_char, ColorScheme.WALL_EXPLORED)
-                    else:
-                        line += get_colored_char(ASCIIChars.FLOOR_EXPLORED, ColorScheme.FLOOR_EXPLORED)
-                else:
-                    line += ' '
-            lines.append(line)
-        return '\n'.join(lines)
+        self.renderer.render(player_x, player_y, monster_manager, item_manager)
+        return self.renderer.frame()
+    
+    def render_frame_diff(self, player_x: int, player_y: int,
+                          monster_manager=None, item_manager=None) -> Dict[int, List[Cell]]:
+        """Update the cached cells and return only the rows that changed,
+        without building any markup."""
+        return self.renderer.render(player_x, player_y, monster_manager, item_manager)
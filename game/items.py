@@ -2,15 +2,7 @@
 
 import random
 from typing import List, Dict, Optional, Tuple
-from enum import Enum
-
-
-class ItemType(Enum):
-    """Underwater item types."""
-    OXYGEN_TANK = ("⊕", "Oxygen Tank", "Restores 25 oxygen")
-    RESEARCH_DATA = ("◌", "Research Data", "Valuable research data")
-    SIGNAL_FLARE = ("✦", "Signal Flare", "A flare that may attract help?")
-    HARPOON_UPGRADE = ("†", "Harpoon Upgrade", "Increases harpoon strength")
+from .content import ITEM_DEFS, ITEM_SPAWNS, ItemType
 
 
 class Item:
@@ -20,39 +12,17 @@ class Item:
         self.x = x
         self.y = y
         self.item_type = item_type
-        self.symbol = item_type.value[0]
-        self.name = item_type.value[1]
-        self.description = item_type.value[2]
+        self.definition = ITEM_DEFS[item_type]
+        self.symbol = self.definition.symbol
+        self.style = self.definition.style
+        self.name = self.definition.name
+        self.description = self.definition.description
         self.value = value
         self.is_collected = False
     
-    def use(self, player) -> str:
+    def use(self, player, rng: Optional[random.Random] = None) -> str:
         """Use the item on the diver."""
-        if self.item_type == ItemType.OXYGEN_TANK:
-            heal_amount = min(25, player.max_hp - player.hp)
-            player.hp += heal_amount
-            return f"You use the oxygen tank and recover {heal_amount} oxygen!"
-        
-        elif self.item_type == ItemType.SIGNAL_FLARE:
-            effect = random.choice(["heal", "damage_boost", "nothing"])
-            if effect == "heal":
-                heal_amount = random.randint(10, 30)
-                player.hp = min(player.max_hp, player.hp + heal_amount)
-                return f"The flare's glow revitalizes you! +{heal_amount} oxygen."
-            elif effect == "damage_boost":
-                player.attack_power += 2
-                return "The flare sharpens your senses! Harpoon Strength +2!"
-            else:
-                return "The flare fizzles. Nothing happens."
-        
-        elif self.item_type == ItemType.HARPOON_UPGRADE:
-            player.attack_power += 5
-            return "You upgrade your harpoon! Strength increased by 5!"
-        
-        elif self.item_type == ItemType.RESEARCH_DATA:
-            return f"You collect {self.value} research data points."
-        
-        return f"You can't use the {self.name}."
+        return self.definition.use(self, player, rng or random)
 
 
 class Inventory:
@@ -63,7 +33,7 @@ class Inventory:
         self.data_points = 0   # formerly gold
     
     def add_item(self, item: Item) -> str:
-        if item.item_type == ItemType.RESEARCH_DATA:
+        if item.definition.is_data:
             self.data_points += item.value
             return f"Collected {item.value} research data!"
         else:
@@ -73,12 +43,13 @@ class Inventory:
                 self.items[item.item_type] = item.value
             return f"Picked up {item.name}!"
     
-    def use_item(self, item_type: ItemType, player) -> Optional[str]:
+    def use_item(self, item_type: ItemType, player,
+                 rng: Optional[random.Random] = None) -> Optional[str]:
         if item_type not in self.items or self.items[item_type] <= 0:
             return None
         
         temp_item = Item(0, 0, item_type)
-        effect_message = temp_item.use(player)
+        effect_message = temp_item.use(player, rng)
         
         self.items[item_type] -= 1
         if self.items[item_type] <= 0:
@@ -97,44 +68,35 @@ class Inventory:
 
 
 class ItemManager:
-    """Manages all items in the game world."""
+    """Manages all items in the game world.
     
-    def __init__(self):
+    Uncollected items are indexed by position for O(1) ``get_item_at``.
+    """
+    
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng if rng is not None else random
         self.items: List[Item] = []
+        self._positions: Dict[Tuple[int, int], Item] = {}
     
-    def spawn_items(self, game_map, count: int = 8):
-        from .dungeon_generator import DungeonGenerator
-        
-        generator = DungeonGenerator(len(game_map[0]), len(game_map))
-        positions = generator.find_valid_positions(game_map, count)
+    def spawn_items(self, game_map, count: int = 8, rng: Optional[random.Random] = None):
+        rng = rng if rng is not None else self.rng
+        positions = game_map.reserve_positions(count, rng)
         
-        for i, (x, y) in enumerate(positions):
-            rand = random.random()
-            
-            if rand < 0.4:      # 40% research data
-                item_type = ItemType.RESEARCH_DATA
-                value = random.randint(5, 20)
-            elif rand < 0.7:    # 30% oxygen tank
-                item_type = ItemType.OXYGEN_TANK
-                value = 1
-            elif rand < 0.9:    # 20% signal flare
-                item_type = ItemType.SIGNAL_FLARE
-                value = 1
-            else:                # 10% harpoon upgrade
-                item_type = ItemType.HARPOON_UPGRADE
-                value = 1
-            
-            item = Item(x, y, item_type, value)
-            self.items.append(item)
+        for x, y in positions:
+            definition = ITEM_SPAWNS.roll(rng)
+            item = Item(x, y, definition.item_type, definition.roll_value(rng))
+            self.add_item(item)
+    
+    def add_item(self, item: Item):
+        self.items.append(item)
+        if not item.is_collected:
+            self._positions[(item.x, item.y)] = item
     
     def get_item_at(self, x: int, y: int) -> Optional[Item]:
-        for item in self.items:
-            if item.x == x and item.y == y and not item.is_collected:
-                return item
-        return None
+        return self._positions.get((x, y))
     
     def collect_item(self, x: int, y: int) -> Optional[Item]:
-        item = self.get_item_at(x, y)
+        item = self._positions.pop((x, y), None)
         if item:
             item.is_collected = True
             return item
@@ -1,68 +1,171 @@
 """Monster system for Terminus Veil."""
 
+import heapq
 import random
-from typing import List, Tuple, Optional
-from enum import Enum
+from array import array
+from operator import itemgetter
+from typing import Dict, Iterator, List, Tuple, Optional
+from .actions import Action, AttackAction, IdleAction, MoveAction
+from .content import (CREATURE_BY_TYPE, CREATURE_DEFS, DEPTH_ATTACK_BONUS, DEPTH_HP_BONUS,
+                      CreatureDef, MonsterType, creature_spawns)
 
 
-class MonsterType(Enum):
-    """Underwater creatures."""
-    JELLYFISH = ("〰", 20, 5, "Jellyfish")
-    ANGLERFISH = ("☉", 35, 8, "Anglerfish")
-    LEVIATHAN = ("◈", 100, 15, "Leviathan")
+# Creatures chase a diver they can see within this many steps.
+AGGRO_RADIUS = 8
+
+# Energy scheduling: a diver turn lasts TURN_TIME ticks and a creature acts
+# every TURN_TIME * NORMAL_SPEED / speed ticks.
+TURN_TIME = 100
+NORMAL_SPEED = 100
+
+# Creatures farther than this from the diver sleep and cost nothing per turn.
+WAKE_RADIUS = 12
+
+# Orthogonal steps first, so ties prefer straight moves over diagonals.
+_NEIGHBOURS = ((0, -1), (1, 0), (0, 1), (-1, 0), (1, -1), (1, 1), (-1, 1), (-1, -1))
+
+
+class MonsterStore:
+    """Creature state as parallel arrays (struct of arrays), one slot each.
+    
+    Every column is an ``array`` of machine ints and ``views[slot]`` is the
+    ``Monster`` reading and writing that slot. Removal moves the last slot
+    into the hole, so the columns stay dense without shifting.
+    """
+    
+    COLUMNS = ('xs', 'ys', 'hps', 'max_hps', 'attacks', 'types', 'perception', 'speeds')
+    
+    def __init__(self):
+        self.xs = array('i')
+        self.ys = array('i')
+        self.hps = array('i')
+        self.max_hps = array('i')
+        self.attacks = array('i')
+        self.types = array('B')
+        self.perception = array('i')
+        self.speeds = array('i')
+        self.views: List["Monster"] = []
+        self.dead: List["Monster"] = []
+    
+    def __len__(self) -> int:
+        return len(self.views)
+    
+    def append(self, view: "Monster", *row: int) -> int:
+        for name, value in zip(self.COLUMNS, row):
+            getattr(self, name).append(value)
+        self.views.append(view)
+        return len(self.views) - 1
+    
+    def row(self, slot: int) -> Tuple[int, ...]:
+        return tuple(getattr(self, name)[slot] for name in self.COLUMNS)
+    
+    def swap_remove(self, slot: int):
+        """Drop a slot; its view keeps working on a private copy of the row."""
+        self.views[slot]._move_to(MonsterStore())
+        last = len(self.views) - 1
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[slot] = column[last]
+            column.pop()
+        moved = self.views.pop()
+        if slot != last:
+            self.views[slot] = moved
+            moved._slot = slot
+
+
+def _column(name: str) -> property:
+    def get(self):
+        return getattr(self._store, name)[self._slot]
+    
+    def set(self, value):
+        getattr(self._store, name)[self._slot] = value
+    
+    return property(get, set)
 
 
 class Monster:
-    """Represents a sea creature."""
-    
-    def __init__(self, x: int, y: int, monster_type: MonsterType):
-        self.x = x
-        self.y = y
-        self.monster_type = monster_type
-        self.symbol = monster_type.value[0]
-        self.max_hp = monster_type.value[1]
-        self.hp = self.max_hp
-        self.attack_power = monster_type.value[2]
-        self.name = monster_type.value[3]
-        self.is_alive = True
+    """Represents a sea creature.
+    
+    A creature is a view onto one slot of a ``MonsterStore``. Built on its
+    own it gets a private one-slot store; ``MonsterManager.add_monster``
+    moves it into the shared one. ``perception_radius`` is how far away it
+    notices a diver it can see; stats and ``speed`` default to its
+    ``CREATURES`` entry.
+    """
+    
+    __slots__ = ('_store', '_slot')
+    
+    x = _column('xs')
+    y = _column('ys')
+    hp = _column('hps')
+    max_hp = _column('max_hps')
+    attack_power = _column('attacks')
+    perception_radius = _column('perception')
+    speed = _column('speeds')
+    
+    def __init__(self, x: int, y: int, monster_type: MonsterType,
+                 perception_radius: int = AGGRO_RADIUS, speed: Optional[int] = None):
+        definition = CREATURE_BY_TYPE[monster_type]
+        if speed is None:
+            speed = definition.speed
+        self._store = MonsterStore()
+        self._slot = self._store.append(self, x, y, definition.hp, definition.hp,
+                                        definition.attack, definition.code,
+                                        perception_radius, speed)
+    
+    @classmethod
+    def view(cls, store: MonsterStore, slot: int) -> "Monster":
+        """A creature backed by an already filled slot of ``store``."""
+        monster = cls.__new__(cls)
+        monster._store = store
+        monster._slot = slot
+        return monster
+    
+    def _move_to(self, store: MonsterStore):
+        """Copy this creature's row into ``store`` and view it there."""
+        row = self._store.row(self._slot)
+        self._store = store
+        self._slot = store.append(self, *row)
+    
+    @property
+    def definition(self) -> CreatureDef:
+        return CREATURE_DEFS[self._store.types[self._slot]]
+    
+    @property
+    def monster_type(self) -> MonsterType:
+        return self.definition.monster_type
+    
+    @property
+    def name(self) -> str:
+        return self.definition.name
+    
+    @property
+    def style(self) -> str:
+        return self.definition.style
+    
+    @property
+    def is_alive(self) -> bool:
+        return self.hp > 0
+    
+    @property
+    def symbol(self) -> str:
+        return self.definition.symbol if self.is_alive else '☠'
     
     def take_damage(self, damage: int) -> bool:
+        was_alive = self.is_alive
         self.hp = max(0, self.hp - damage)
         if self.hp <= 0:
-            self.is_alive = False
-            self.symbol = '☠'
+            if was_alive:
+                self._store.dead.append(self)
             return True
         return False
     
-    def attack(self, target) -> int:
+    def attack(self, target, rng: Optional[random.Random] = None) -> int:
         if not self.is_alive:
             return 0
-        damage = random.randint(max(1, self.attack_power - 2), self.attack_power + 2)
+        damage = (rng or random).randint(max(1, self.attack_power - 2), self.attack_power + 2)
         return damage
     
-    def move_towards(self, target_x: int, target_y: int, game_map) -> bool:
-        if not self.is_alive:
-            return False
-        dx = 0
-        dy = 0
-        if target_x > self.x:
-            dx = 1
-        elif target_x < self.x:
-            dx = -1
-        if target_y > self.y:
-            dy = 1
-        elif target_y < self.y:
-            dy = -1
-        new_x = self.x + dx
-        new_y = self.y + dy
-        if (0 <= new_x < len(game_map[0]) and 
-            0 <= new_y < len(game_map) and 
-            game_map[new_y][new_x] != '#'):
-            self.x = new_x
-            self.y = new_y
-            return True
-        return False
-    
     def distance_to(self, x: int, y: int) -> float:
         return ((self.x - x) ** 2 + (self.y - y) ** 2) ** 0.5
     
@@ -71,110 +174,225 @@ class Monster:
 
 
 class MonsterManager:
-    """Manages all sea creatures."""
+    """Manages all sea creatures.
     
-    def __init__(self):
-        self.monsters: List[Monster] = []
+    Creatures live in one ``MonsterStore``; ``monsters`` lists their views.
+    Live creatures are also indexed by position so ``get_monster_at`` is a
+    single dict lookup for both the renderer and the AI.
+    
+    Turns are driven by an energy scheduler: awake creatures wait in a
+    priority queue keyed on the tick of their next action, so faster ones
+    act more often. Creatures beyond WAKE_RADIUS sleep in a bucket grid
+    and are only woken when the diver comes near, so per-turn cost
+    follows the active creatures, not the population. Pursuit follows one
+    breadth-first flow field from the diver, built at most once per turn
+    and shared by every creature, so each move is a lookup among neighbours.
+    """
+    
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng if rng is not None else random
+        self.store = MonsterStore()
+        self._positions: Dict[Tuple[int, int], Monster] = {}
+        self.time = 0
+        self._queue: List[Tuple[int, int, Monster]] = []
+        self._sequence = 0
+        # Sleeping creatures by WAKE_RADIUS-sized bucket; dicts keep wake order stable.
+        self._dormant: Dict[Tuple[int, int], Dict[Monster, None]] = {}
+    
+    @property
+    def monsters(self) -> List[Monster]:
+        return list(self.store.views)
     
-    def spawn_monsters(self, game_map, count: int = 5, level: int = 1):
-        from .dungeon_generator import DungeonGenerator
+    def spawn_monsters(self, game_map, count: int = 5, level: int = 1,
+                       rng: Optional[random.Random] = None):
+        from .game_map import MONSTER_SPAWN_DISTANCE, MONSTER_SPAWN_SPACING
         
-        generator = DungeonGenerator(len(game_map[0]), len(game_map))
-        positions = generator.find_valid_positions(game_map, count)
+        rng = rng if rng is not None else self.rng
+        positions = game_map.reserve_positions(count, rng, MONSTER_SPAWN_DISTANCE,
+                                               MONSTER_SPAWN_SPACING)
         
-        for i, (x, y) in enumerate(positions):
-            rand = random.random()
-            
-            if level == 1:
-                if rand < 0.8:
-                    monster_type = MonsterType.JELLYFISH
-                else:
-                    monster_type = MonsterType.ANGLERFISH
-            elif level <= 3:
-                if rand < 0.5:
-                    monster_type = MonsterType.JELLYFISH
-                elif rand < 0.9:
-                    monster_type = MonsterType.ANGLERFISH
-                else:
-                    monster_type = MonsterType.LEVIATHAN
-            else:
-                if rand < 0.3:
-                    monster_type = MonsterType.JELLYFISH
-                elif rand < 0.7:
-                    monster_type = MonsterType.ANGLERFISH
-                else:
-                    monster_type = MonsterType.LEVIATHAN
-            
-            monster = Monster(x, y, monster_type)
+        spawns = creature_spawns(level)
+        for x, y in positions:
+            monster = Monster(x, y, spawns.roll(rng).monster_type)
             
             if level > 1:
-                bonus_hp = (level - 1) * 5
-                bonus_attack = (level - 1) * 2
+                bonus_hp = (level - 1) * DEPTH_HP_BONUS
+                bonus_attack = (level - 1) * DEPTH_ATTACK_BONUS
                 monster.max_hp += bonus_hp
                 monster.hp += bonus_hp
                 monster.attack_power += bonus_attack
             
-            self.monsters.append(monster)
+            self.add_monster(monster)
+    
+    def add_monster(self, monster: Monster):
+        monster._move_to(self.store)
+        self._positions[(monster.x, monster.y)] = monster
+        self._sleep(monster)
+    
+    def schedule_state(self) -> Tuple[List[Tuple[int, int]], List[int]]:
+        """Awake creatures as (slot, tick) in queue order, and sleeping slots
+        in wake order; together with ``time`` this is the whole scheduler."""
+        return self.order_schedule(*self.schedule_entries())
+    
+    def schedule_entries(self) -> Tuple[List["Monster"], List[Tuple[int, int, "Monster"]],
+                                        List[Tuple[int, int]], List[List["Monster"]]]:
+        """The scheduler copied without walking it: the views in slot order,
+        the awake queue, and the sleeping bucket keys with their creatures.
+        ``order_schedule`` sorts these into ``schedule_state`` form."""
+        dormant = self._dormant
+        return self.store.views[:], self._queue[:], list(dormant), list(map(list, dormant.values()))
+    
+    @staticmethod
+    def order_schedule(views: List["Monster"], queue: List[Tuple[int, int, "Monster"]],
+                       keys: List[Tuple[int, int]], buckets: List[List["Monster"]]
+                       ) -> Tuple[List[Tuple[int, int]], List[int]]:
+        """Turn ``schedule_entries`` into slots; safe to call once the live
+        scheduler has moved on."""
+        slots = {id(view): slot for slot, view in enumerate(views)}
+        awake = [(slots[id(monster)], tick) for tick, _, monster in sorted(queue)
+                 if id(monster) in slots]
+        asleep = [slots[id(monster)]
+                  for _, bucket in sorted(zip(keys, buckets), key=itemgetter(0))
+                  for monster in bucket]
+        return awake, asleep
+    
+    def adopt_store(self, store: MonsterStore, time: int,
+                    awake: List[Tuple[int, int]], asleep: List[int]):
+        """Replace every creature with the rows of ``store`` and restore the
+        scheduler from ``schedule_state`` output."""
+        self.store = store
+        store.views = [Monster.view(store, slot) for slot in range(len(store.xs))]
+        self._positions = {(monster.x, monster.y): monster for monster in store.views}
+        self.time = time
+        self._queue = []
+        self._sequence = 0
+        self._dormant = {}
+        for slot, tick in awake:
+            self._schedule(store.views[slot], tick)
+        for slot in asleep:
+            self._sleep(store.views[slot])
+    
+    @property
+    def awake_count(self) -> int:
+        return len(self._queue)
+    
+    def _sleep(self, monster: Monster):
+        bucket = (monster.x // WAKE_RADIUS, monster.y // WAKE_RADIUS)
+        self._dormant.setdefault(bucket, {})[monster] = None
+    
+    def _schedule(self, monster: Monster, tick: int):
+        self._sequence += 1
+        heapq.heappush(self._queue, (tick, self._sequence, monster))
+    
+    def _wake_near(self, x: int, y: int):
+        """Queue sleeping creatures within WAKE_RADIUS of (x, y) to act once this turn."""
+        bucket_x, bucket_y = x // WAKE_RADIUS, y // WAKE_RADIUS
+        for by in (bucket_y - 1, bucket_y, bucket_y + 1):
+            for bx in (bucket_x - 1, bucket_x, bucket_x + 1):
+                bucket = self._dormant.get((bx, by))
+                if not bucket:
+                    continue
+                for monster in [m for m in bucket if m.distance_to(x, y) <= WAKE_RADIUS]:
+                    del bucket[monster]
+                    self._schedule(monster, self.time + TURN_TIME)
     
     def get_monster_at(self, x: int, y: int) -> Optional[Monster]:
-        for monster in self.monsters:
-            if monster.x == x and monster.y == y and monster.is_alive:
-                return monster
+        monster = self._positions.get((x, y))
+        if monster and monster.is_alive:
+            return monster
         return None
     
     def remove_dead_monsters(self):
-        self.monsters = [m for m in self.monsters if m.is_alive]
+        store = self.store
+        positions = self._positions
+        for monster in store.dead:
+            if monster._store is store:
+                if positions.get((monster.x, monster.y)) is monster:
+                    del positions[(monster.x, monster.y)]
+                bucket = self._dormant.get((monster.x // WAKE_RADIUS, monster.y // WAKE_RADIUS))
+                if bucket:
+                    bucket.pop(monster, None)
+                store.swap_remove(monster._slot)
+        store.dead = []
+    
+    def _relocate(self, monster: Monster, old_x: int, old_y: int):
+        if self._positions.get((old_x, old_y)) is monster:
+            del self._positions[(old_x, old_y)]
+        self._positions[(monster.x, monster.y)] = monster
+    
+    def move_monster(self, monster: Monster, x: int, y: int):
+        old_x, old_y = monster.x, monster.y
+        monster.x, monster.y = x, y
+        self._relocate(monster, old_x, old_y)
     
-    def update_monsters(self, player_x: int, player_y: int, game_map, 
-                       visibility_tracker) -> List[str]:
-        messages = []
-        for monster in self.monsters[:]:
-            if not monster.is_alive:
+    def take_turns(self, player_x: int, player_y: int, game_map,
+                   visibility_tracker) -> Iterator[Action]:
+        """Yield one action for every creature due to act this turn.
+        
+        Each action must be resolved before the next is requested, so later
+        creatures see where earlier ones moved.
+        """
+        flow_field = None
+        self._wake_near(player_x, player_y)
+        self.time += TURN_TIME
+        queue = self._queue
+        while queue and queue[0][0] <= self.time:
+            tick, _, monster = heapq.heappop(queue)
+            if monster._store is not self.store or not monster.is_alive:
                 continue
-            if not visibility_tracker.is_visible(monster.x, monster.y):
+            if monster.distance_to(player_x, player_y) > WAKE_RADIUS:
+                self._sleep(monster)
                 continue
-            if monster.is_adjacent_to(player_x, player_y):
-                damage = monster.attack(None)
-                messages.append(f"{monster.name} lashes out for {damage} damage!")
+            self._schedule(monster, tick + TURN_TIME * NORMAL_SPEED // max(1, monster.speed))
+            # The diver's shadowcast FOV is symmetric: a creature the diver
+            # can see can see the diver, so no line-of-sight walk of its own.
+            if not visibility_tracker.is_visible(monster.x, monster.y):
+                yield IdleAction(monster)
+            elif monster.is_adjacent_to(player_x, player_y):
+                yield AttackAction(monster)
+            elif monster.distance_to(player_x, player_y) <= monster.perception_radius:
+                if flow_field is None:
+                    flow_field = self.build_flow_field(player_x, player_y, game_map)
+                target = self._downhill_step(monster, flow_field, game_map.width)
+                yield MoveAction(monster, *target) if target else IdleAction(monster)
             else:
-                distance = monster.distance_to(player_x, player_y)
-                if distance <= 8:
-                    if self._can_see_player(monster, player_x, player_y, game_map):
-                        old_x, old_y = monster.x, monster.y
-                        if monster.move_towards(player_x, player_y, game_map):
-                            conflicting_monster = self.get_monster_at(monster.x, monster.y)
-                            if conflicting_monster and conflicting_monster != monster:
-                                monster.x, monster.y = old_x, old_y
-        return messages
-    
-    def _can_see_player(self, monster: Monster, player_x: int, player_y: int, 
-                       game_map) -> bool:
-        dx = abs(player_x - monster.x)
-        dy = abs(player_y - monster.y)
-        if dx == 0 and dy == 0:
-            return True
-        x1, y1 = monster.x, monster.y
-        x2, y2 = player_x, player_y
-        x_step = 1 if x1 < x2 else -1
-        y_step = 1 if y1 < y2 else -1
-        if dx > dy:
-            error = dx / 2
-            y = y1
-            for x in range(x1, x2, x_step):
-                if game_map[y][x] == '#':
-                    return False
-                error -= dy
-                if error < 0:
-                    y += y_step
-                    error += dx
-        else:
-            error = dy / 2
-            x = x1
-            for y in range(y1, y2, y_step):
-                if game_map[y][x] == '#':
-                    return False
-                error -= dx
-                if error < 0:
-                    x += x_step
-                    error += dy
-        return True
+                yield IdleAction(monster)
+    
+    @staticmethod
+    def build_flow_field(player_x: int, player_y: int, game_map,
+                         radius: int = AGGRO_RADIUS) -> Dict[int, int]:
+        """Steps from the diver to each walkable cell at most ``radius`` moves
+        away (8-directional), keyed by flat index ``y * width + x``."""
+        width, height = game_map.width, game_map.height
+        walkable = game_map.walkable
+        field = {player_y * width + player_x: 0}
+        frontier = [(player_x, player_y)]
+        for distance in range(1, radius + 1):
+            next_frontier = []
+            for x, y in frontier:
+                for dx, dy in _NEIGHBOURS:
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < width and 0 <= ny < height:
+                        index = ny * width + nx
+                        if walkable[index] and index not in field:
+                            field[index] = distance
+                            next_frontier.append((nx, ny))
+            frontier = next_frontier
+        return field
+    
+    def _downhill_step(self, monster: Monster, flow_field: Dict[int, int],
+                       width: int) -> Optional[Tuple[int, int]]:
+        """The free neighbour closest to the diver, if it is closer."""
+        best = flow_field.get(monster.y * width + monster.x)
+        if best is None:
+            return None
+        target = None
+        for dx, dy in _NEIGHBOURS:
+            x, y = monster.x + dx, monster.y + dy
+            if not 0 <= x < width:
+                continue
+            distance = flow_field.get(y * width + x)
+            if distance is not None and distance < best and self.get_monster_at(x, y) is None:
+                best = distance
+                target = (x, y)
+        return target
@@ -0,0 +1,210 @@
+"""Incremental map renderer for Terminus Veil."""
+
+from typing import Dict, List, Optional, Set, Tuple
+from .ascii_art import ASCIIChars, ColorScheme, get_colored_char
+from .tiles import EXIT
+
+
+# A rendered cell is (glyph, color markup); an empty color means unstyled.
+Cell = Tuple[str, str]
+
+BLANK_CELL: Cell = (' ', '')
+
+
+def cells_to_markup(cells: List[Cell]) -> str:
+    """Join cells into markup, emitting one span per run of equal color."""
+    parts = []
+    run = []
+    run_color = None
+    for char, color in cells:
+        if color != run_color:
+            if run:
+                parts.append(_span(run, run_color))
+                run = []
+            run_color = color
+        run.append(char)
+    if run:
+        parts.append(_span(run, run_color))
+    return ''.join(parts)
+
+
+def _span(chars: List[str], color: str) -> str:
+    text = ''.join(chars)
+    return get_colored_char(text, color) if color else text
+
+
+class MapRenderer:
+    """Keeps the last rendered frame and rebuilds only rows that changed.
+
+    Only a viewport window of the map is rendered. It defaults to the whole
+    map; ``set_viewport`` shrinks it to the screen size, after which the
+    camera follows the diver and the per-frame cost depends on the window,
+    not the world. ``cells``, ``lines`` and frame diffs use viewport rows.
+    Markup is only built when ``lines`` or ``frame`` is read, for the rows
+    that changed since; the line-API display reads ``cells`` directly.
+
+    Rows are marked dirty when the visible area changes, when tiles are
+    explored for the first time, when an entity glyph inside it appears, moves or
+    disappears, or when a tile is mutated through ``mark_dirty``.
+    """
+
+    def __init__(self, game_map):
+        self.game_map = game_map
+        self.view_width = game_map.width
+        self.view_height = game_map.height
+        self.camera_x = 0
+        self.camera_y = 0
+        self._last_visible: Set[int] = set()
+        self._last_overlay: Dict[int, Cell] = {}
+        self._tracker = None
+        self._reset_frame()
+
+    def _reset_frame(self):
+        self.cells: List[List[Cell]] = [[] for _ in range(self.view_height)]
+        self._lines: List[str] = [''] * self.view_height
+        self._stale_lines: Set[int] = set(range(self.view_height))
+        self._dirty_rows: Set[int] = set(range(self.view_height))
+
+    def set_viewport(self, width: int, height: int):
+        """Render a window of at most ``width`` x ``height`` cells."""
+        width = max(1, min(width, self.game_map.width))
+        height = max(1, min(height, self.game_map.height))
+        if (width, height) != (self.view_width, self.view_height):
+            self.view_width = width
+            self.view_height = height
+            self._reset_frame()
+
+    def _follow(self, player_x: int, player_y: int):
+        """Centre the camera on the diver, clamped to the map edges."""
+        camera_x = min(max(0, player_x - self.view_width // 2),
+                       self.game_map.width - self.view_width)
+        camera_y = min(max(0, player_y - self.view_height // 2),
+                       self.game_map.height - self.view_height)
+        if (camera_x, camera_y) != (self.camera_x, self.camera_y):
+            self.camera_x = camera_x
+            self.camera_y = camera_y
+            self.invalidate()
+
+    def mark_dirty(self, x: int, y: int):
+        row = y - self.camera_y
+        if 0 <= row < self.view_height:
+            self._dirty_rows.add(row)
+
+    def invalidate(self):
+        self._dirty_rows = set(range(self.view_height))
+
+    @property
+    def lines(self) -> List[str]:
+        """Markup for every viewport row."""
+        for y in self._stale_lines:
+            self._lines[y] = cells_to_markup(self.cells[y])
+        self._stale_lines = set()
+        return self._lines
+    
+    def frame(self) -> str:
+        return '\n'.join(self.lines)
+
+    def render(self, player_x: int, player_y: int, monster_manager=None,
+               item_manager=None) -> Dict[int, List[Cell]]:
+        """Bring the cached cells up to date and return the rows that changed."""
+        width = self.game_map.width
+        tracker = self.game_map.visibility_tracker
+        if tracker is not self._tracker:
+            self._tracker = tracker
+            self.invalidate()
+        self._follow(player_x, player_y)
+        camera_y = self.camera_y
+        view_height = self.view_height
+        visible = set(tracker.visible_indices)
+        overlay = self._build_overlay(visible, player_x, player_y,
+                                      monster_manager, item_manager)
+
+        touched = set()
+        for index in visible.symmetric_difference(self._last_visible):
+            touched.add(index // width)
+        for _, y in tracker.drain_newly_explored():
+            touched.add(y)
+        last_overlay = self._last_overlay
+        for index, cell in overlay.items():
+            if last_overlay.get(index) != cell:
+                touched.add(index // width)
+        for index in last_overlay:
+            if index not in overlay:
+                touched.add(index // width)
+        self._last_visible = visible
+        self._last_overlay = overlay
+
+        dirty = self._dirty_rows
+        for y in touched:
+            if 0 <= y - camera_y < view_height:
+                dirty.add(y - camera_y)
+
+        changed = {}
+        for y in sorted(dirty):
+            cells = self._build_row(y, overlay)
+            if cells != self.cells[y]:
+                self.cells[y] = cells
+                self._stale_lines.add(y)
+                changed[y] = cells
+        self._dirty_rows = set()
+        return changed
+
+    def _build_overlay(self, visible: Set[int], player_x: int, player_y: int,
+                       monster_manager, item_manager) -> Dict[int, Cell]:
+        """Entity glyphs drawn over the terrain, keyed by flat cell index."""
+        width = self.game_map.width
+        overlay = {}
+        if monster_manager or item_manager:
+            for index in visible:
+                cell = self._entity_cell(index % width, index // width,
+                                         monster_manager, item_manager)
+                if cell:
+                    overlay[index] = cell
+        if 0 <= player_x < width and 0 <= player_y < self.game_map.height:
+            overlay[player_y * width + player_x] = (ASCIIChars.PLAYER, ColorScheme.PLAYER)
+        return overlay
+
+    def _entity_cell(self, x: int, y: int, monster_manager,
+                     item_manager) -> Optional[Cell]:
+        if monster_manager:
+            monster = monster_manager.get_monster_at(x, y)
+            if monster:
+                if not monster.is_alive:
+                    return (monster.symbol, ColorScheme.CORPSE)
+                return (monster.symbol, monster.style)
+        if item_manager:
+            item = item_manager.get_item_at(x, y)
+            if item:
+                return (item.symbol, item.style)
+        return None
+
+    def _build_row(self, row: int, overlay: Dict[int, Cell]) -> List[Cell]:
+        game_map = self.game_map
+        width = game_map.width
+        y = self.camera_y + row
+        codes = game_map.tiles.codes
+        opaque = game_map.tiles.opaque
+        visible = game_map.visibility_tracker.visible_grid
+        explored = game_map.visibility_tracker.explored_grid
+        wall_glyphs = game_map.wall_renderer.row_glyphs(y)
+        floor = (ASCIIChars.FLOOR, ColorScheme.FLOOR)
+        exit_cell = (ASCIIChars.EXIT, ColorScheme.EXIT)
+        floor_explored = (ASCIIChars.FLOOR_EXPLORED, ColorScheme.FLOOR_EXPLORED)
+
+        cells = []
+        base = y * width
+        for x in range(self.camera_x, self.camera_x + self.view_width):
+            index = base + x
+            cell = overlay.get(index)
+            if cell is None:
+                if opaque[index]:
+                    color = ColorScheme.WALL if explored[index] else ColorScheme.WALL_EXPLORED
+                    cell = (wall_glyphs[x], color)
+                elif visible[index]:
+                    cell = exit_cell if codes[index] == EXIT.code else floor
+                elif explored[index]:
+                    cell = floor_explored
+                else:
+                    cell = BLANK_CELL
+            cells.append(cell)
+        return cells
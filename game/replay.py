@@ -0,0 +1,189 @@
+"""Action recording and headless replay for Terminus Veil.
+
+A recording is the run seed and map settings followed by one byte per
+action, the index of the action in ``Engine.ACTIONS``. Since every random
+stream is derived from the seed, that is enough to rebuild the whole dive.
+A dive that was resumed from a save embeds the compressed starting
+snapshot instead. On close the recorder appends the turn count and a
+SHA-256 of the final state, which the replayer checks.
+
+    python -m game.replay dive.rec
+"""
+
+import argparse
+import hashlib
+import statistics
+import struct
+import sys
+import time
+import zlib
+from typing import BinaryIO, List, Optional
+from .engine import Engine
+from .events import Event, EventType
+from .save import restore_snapshot, snapshot
+
+
+MAGIC = b'TVREC'
+REPLAY_VERSION = 1
+
+_HEADER = struct.Struct('<5sHQIIHI')   # magic, version, seed, width, height, name and snapshot lengths
+_FOOTER = struct.Struct('<I32s')        # turns, final state digest
+_END = 0xFF
+
+_ACTION_CODES = {action: code for code, action in enumerate(Engine.ACTIONS)}
+
+
+def state_hash(engine: Engine) -> bytes:
+    """SHA-256 of everything a save file would hold."""
+    return hashlib.sha256(snapshot(engine)).digest()
+
+
+class Recorder:
+    """Appends every action an engine performs to a recording.
+    
+    Actions are picked up from ``engine.events``, so it does not matter what
+    drives the engine. Pass ``resumed=True`` when the engine did not start
+    from its seed (e.g. it was loaded from a save) to embed its state.
+    """
+    
+    def __init__(self, engine: Engine, path: str, resumed: bool = False):
+        self.engine = engine
+        self.turns = 0
+        self._file: Optional[BinaryIO] = open(path, 'wb')
+        algorithm = engine.map_algorithm.encode('utf-8')
+        start = zlib.compress(snapshot(engine), 1) if resumed else b''
+        self._file.write(_HEADER.pack(MAGIC, REPLAY_VERSION, engine.seed, engine.map_width,
+                                      engine.map_height, len(algorithm), len(start)))
+        self._file.write(algorithm)
+        self._file.write(start)
+        engine.events.subscribe(self._on_event)
+    
+    def _on_event(self, event: Event):
+        if event.event_type is EventType.ACTION:
+            self._file.write(bytes((_ACTION_CODES[event.fields['action']],)))
+            self.turns += 1
+    
+    def close(self):
+        """Stop recording and seal the log with the final state hash."""
+        if self._file is None:
+            return
+        self.engine.events.unsubscribe(self._on_event)
+        self._file.write(bytes((_END,)))
+        self._file.write(_FOOTER.pack(self.turns, state_hash(self.engine)))
+        self._file.close()
+        self._file = None
+
+
+class Recording:
+    """A parsed recording."""
+    
+    def __init__(self, seed: int, map_width: int, map_height: int, map_algorithm: str,
+                 start: bytes, actions: List[str], final_hash: Optional[bytes]):
+        self.seed = seed
+        self.map_width = map_width
+        self.map_height = map_height
+        self.map_algorithm = map_algorithm
+        self.start = start
+        self.actions = actions
+        self.final_hash = final_hash
+    
+    def new_engine(self) -> Engine:
+        """The engine as it was when recording began, without pre-generation."""
+        if self.start:
+            return restore_snapshot(zlib.decompress(self.start), pregenerate=False)
+        return Engine(self.map_width, self.map_height, pregenerate=False, seed=self.seed,
+                      map_algorithm=self.map_algorithm)
+
+
+def read_recording(path: str) -> Recording:
+    with open(path, 'rb') as log_file:
+        data = log_file.read()
+    if len(data) < _HEADER.size:
+        raise ValueError(f"Not a Terminus Veil recording: {path}")
+    magic, version, seed, width, height, name_length, start_length = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"Not a Terminus Veil recording: {path}")
+    if version != REPLAY_VERSION:
+        raise ValueError(f"Unsupported recording version {version} (expected {REPLAY_VERSION})")
+    offset = _HEADER.size
+    algorithm = data[offset:offset + name_length].decode('utf-8')
+    offset += name_length
+    start = data[offset:offset + start_length]
+    offset += start_length
+    
+    end = data.find(bytes((_END,)), offset)
+    final_hash = None
+    if end < 0:
+        end = len(data)   # the recorder never closed; replay what there is
+    else:
+        turns, final_hash = _FOOTER.unpack_from(data, end + 1)
+        if turns != end - offset:
+            raise ValueError(f"Recording holds {end - offset} actions, footer says {turns}")
+    actions = [Engine.ACTIONS[code] for code in data[offset:end]]
+    return Recording(seed, width, height, algorithm, start, actions, final_hash)
+
+
+class ReplayResult:
+    """Per-turn timings and the final state of one replay."""
+    
+    def __init__(self, recording: Recording, engine: Engine, turn_times: List[float]):
+        self.recording = recording
+        self.engine = engine
+        self.turn_times = turn_times   # milliseconds per action
+        self.final_hash = state_hash(engine)
+    
+    @property
+    def verified(self) -> Optional[bool]:
+        """Whether the final state matches the recording; None if it has no hash."""
+        if self.recording.final_hash is None:
+            return None
+        return self.final_hash == self.recording.final_hash
+
+
+def replay(recording: Recording) -> ReplayResult:
+    """Drive a fresh engine through every recorded action as fast as possible."""
+    engine = recording.new_engine()
+    perform = engine.perform
+    clock = time.perf_counter
+    turn_times = []
+    for action in recording.actions:
+        start = clock()
+        perform(action)
+        turn_times.append((clock() - start) * 1000)
+    engine.close()
+    return ReplayResult(recording, engine, turn_times)
+
+
+def _percentile(sorted_times: List[float], fraction: float) -> float:
+    return sorted_times[min(len(sorted_times) - 1, int(fraction * len(sorted_times)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a Terminus Veil recording headlessly")
+    parser.add_argument("path", help="recording written by main.py --record")
+    args = parser.parse_args()
+    
+    recording = read_recording(args.path)
+    start = time.perf_counter()
+    result = replay(recording)
+    elapsed = time.perf_counter() - start
+    
+    times = sorted(result.turn_times) or [0.0]
+    print(f"seed {recording.seed}, {recording.map_width}x{recording.map_height} "
+          f"{recording.map_algorithm}, {len(recording.actions)} turns in {elapsed:.2f}s "
+          f"(depth {result.engine.game_state.current_level} reached)")
+    print(f"{'mean ms':>8} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'max ms':>7}")
+    print(f"{statistics.mean(times):>8.3f} {_percentile(times, 0.5):>7.3f} "
+          f"{_percentile(times, 0.95):>7.3f} {_percentile(times, 0.99):>7.3f} {times[-1]:>7.3f}")
+    print(f"final state {result.final_hash.hex()[:16]}: ", end="")
+    if result.verified is None:
+        print("recording has no final hash")
+    elif result.verified:
+        print("matches the recording")
+    else:
+        print(f"MISMATCH, recorded {recording.final_hash.hex()[:16]}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""Seeded random streams for Terminus Veil.
+
+Every level draws from its own ``random.Random`` instances derived from the
+run seed, the depth and the restart attempt, with separate streams for
+layout, spawns and combat. String seeds are hashed with SHA-512 by
+``random.Random``, so the same seed reproduces the same level in any process.
+"""
+
+import random
+
+
+def derive_rng(seed: int, depth: int, stream: str, attempt: int = 0) -> random.Random:
+    return random.Random(f"{seed}:{depth}:{attempt}:{stream}")
+
+
+def new_run_seed() -> int:
+    return random.SystemRandom().randrange(2 ** 63)
+
+
+class LevelRNG:
+    """Independent random streams for one level."""
+    
+    def __init__(self, seed: int, depth: int, attempt: int = 0):
+        self.seed = seed
+        self.depth = depth
+        self.attempt = attempt
+        self.layout = derive_rng(seed, depth, "layout", attempt)
+        self.spawns = derive_rng(seed, depth, "spawns", attempt)
+        self.combat = derive_rng(seed, depth, "combat", attempt)
@@ -0,0 +1,328 @@
+"""Binary save files for Terminus Veil.
+
+A save is a small fixed header followed by one zlib-compressed body. The
+body is a flat sequence of little-endian ``struct`` fields and raw array
+bytes: the tile codes, explored mask and start distances of the current
+level, every creature column of the ``MonsterStore``, the items, the
+diver, the inventory, the score and the state of every random stream.
+Creature and item types are written by name, so reordering the content
+tables does not break old saves. Nothing is pickled.
+
+``snapshot`` turns the state into an uncompressed body. It is split in
+two: ``capture`` copies the state off the live dive and is cheap enough to
+call between turns, while ``encode`` packs it and ``write_snapshot``
+compresses and writes it. Both are safe to run on a worker thread.
+"""
+
+import os
+import random
+import struct
+import sys
+import zlib
+from array import array
+from operator import attrgetter
+from typing import List, Tuple
+from .combat import GameState
+from .content import CREATURE_BY_TYPE, CREATURE_DEFS, ItemType, MonsterType
+from .engine import Engine, Level
+from .game_map import GameMap
+from .items import Item, ItemManager
+from .monster import MonsterManager, MonsterStore
+from .rng import LevelRNG
+from .tiles import TileGrid
+
+
+MAGIC = b'TVEIL'
+SAVE_VERSION = 1
+
+_HEADER = struct.Struct('<5sHI')   # magic, version, body length
+_BIG_ENDIAN = sys.byteorder == 'big'
+
+
+def _array_bytes(values: array) -> bytes:
+    if _BIG_ENDIAN and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _bytes_array(typecode: str, data) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if _BIG_ENDIAN and values.itemsize > 1:
+        values.byteswap()
+    return values
+
+
+class _Writer:
+    def __init__(self):
+        self.parts: List[bytes] = []
+    
+    def pack(self, fmt: str, *values):
+        self.parts.append(struct.pack('<' + fmt, *values))
+    
+    def blob(self, data: bytes):
+        self.pack('I', len(data))
+        self.parts.append(data)
+    
+    def text(self, value: str):
+        self.blob(value.encode('utf-8'))
+    
+    def array(self, values: array):
+        self.pack('c', values.typecode.encode('ascii'))
+        self.blob(_array_bytes(values))
+    
+    def getvalue(self) -> bytes:
+        return b''.join(self.parts)
+
+
+class _Reader:
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.offset = 0
+    
+    def unpack(self, fmt: str) -> Tuple:
+        fmt = '<' + fmt
+        try:
+            values = struct.unpack_from(fmt, self.data, self.offset)
+        except struct.error as error:
+            raise ValueError("Save file is truncated") from error
+        self.offset += struct.calcsize(fmt)
+        return values
+    
+    def blob(self) -> memoryview:
+        (length,) = self.unpack('I')
+        data = self.data[self.offset:self.offset + length]
+        if len(data) != length:
+            raise ValueError("Save file is truncated")
+        self.offset += length
+        return data
+    
+    def text(self) -> str:
+        return str(self.blob(), 'utf-8')
+    
+    def array(self) -> array:
+        (typecode,) = self.unpack('c')
+        return _bytes_array(typecode.decode('ascii'), self.blob())
+
+
+def _write_rng(writer: _Writer, rng_state: Tuple):
+    version, internal, gauss = rng_state
+    writer.pack('B?d', version, gauss is not None, gauss or 0.0)
+    writer.array(array('I', internal))
+
+
+def _read_rng(reader: _Reader, rng: random.Random):
+    version, has_gauss, gauss = reader.unpack('B?d')
+    internal = tuple(reader.array())
+    rng.setstate((version, internal, gauss if has_gauss else None))
+
+
+_ITEM_FIELDS = attrgetter('x', 'y', 'item_type', 'value', 'is_collected')
+
+
+class Capture:
+    """A copy of everything a save holds, detached from the live dive.
+    
+    Taking one only copies buffers and lists; sorting, slot lookups and
+    packing are left to ``encode``, which can run on another thread while
+    the game goes on.
+    """
+    
+    def __init__(self, engine: Engine):
+        game_map = engine.game_map
+        game_state = engine.game_state
+        player = engine.player
+        tiles = game_map.tiles
+        self.header = (engine.seed, engine.restarts, engine.map_width, engine.map_height)
+        self.algorithm = engine.map_algorithm
+        self.state = (game_state.current_level, game_state.game_over,
+                      game_state.victory, game_state.score)
+        self.player = (player.x, player.y, player.hp, player.max_hp, player.attack_power)
+        self.data_points = player.inventory.data_points
+        self.inventory = list(player.inventory.items.items())
+        level_rng = engine.level_rng
+        self.rng_states = [stream.getstate()
+                           for stream in (level_rng.layout, level_rng.spawns, level_rng.combat)]
+        self.layout = (tiles.width, tiles.height, *game_map.player_start, *game_map.exit_pos)
+        self.codes = bytes(tiles.codes)
+        self.explored = bytes(game_map.visibility_tracker.explored_grid)
+        self.distances = game_map.distance_from_start[:]
+        self.reserved = list(game_map.reserved)
+        monster_manager = engine.monster_manager
+        store = monster_manager.store
+        self.creature_count = len(store)
+        self.columns = [getattr(store, name)[:] for name in MonsterStore.COLUMNS]
+        self.time = monster_manager.time
+        self.schedule = monster_manager.schedule_entries()
+        self.items = list(map(_ITEM_FIELDS, engine.item_manager.items))
+
+
+def capture(engine: Engine) -> Capture:
+    """Copy the dive for a later ``encode``; cheap enough to do between turns."""
+    return Capture(engine)
+
+
+def encode(state: Capture) -> bytes:
+    """Pack a ``Capture`` into an uncompressed save body."""
+    writer = _Writer()
+    writer.pack('QIII', *state.header)
+    writer.text(state.algorithm)
+    writer.pack('I??q', *state.state)
+    writer.pack('iiiii', *state.player)
+    
+    writer.pack('iI', state.data_points, len(state.inventory))
+    for item_type, count in state.inventory:
+        writer.text(item_type.name)
+        writer.pack('i', count)
+    
+    for rng_state in state.rng_states:
+        _write_rng(writer, rng_state)
+    
+    width = state.layout[0]
+    writer.pack('IIiiii', *state.layout)
+    writer.blob(state.codes)
+    writer.blob(state.explored)
+    writer.array(state.distances)
+    writer.array(array('i', sorted(y * width + x for x, y in state.reserved)))
+    
+    writer.pack('I', len(CREATURE_DEFS))
+    for definition in CREATURE_DEFS:
+        writer.text(definition.monster_type.name)
+    writer.pack('I', state.creature_count)
+    for column in state.columns:
+        writer.array(column)
+    awake, asleep = MonsterManager.order_schedule(*state.schedule)
+    writer.pack('q', state.time)
+    writer.array(array('i', [value for entry in awake for value in entry]))
+    writer.array(array('i', asleep))
+    
+    item_types = list(ItemType)
+    writer.pack('I', len(item_types))
+    for item_type in item_types:
+        writer.text(item_type.name)
+    item_codes = {item_type: code for code, item_type in enumerate(item_types)}
+    writer.pack('I', len(state.items))
+    for x, y, item_type, value, is_collected in state.items:
+        writer.pack('iiBi?', x, y, item_codes[item_type], value, is_collected)
+    return writer.getvalue()
+
+
+def snapshot(engine: Engine) -> bytes:
+    """Copy the whole dive into an uncompressed save body."""
+    return encode(capture(engine))
+
+
+def write_snapshot(path: str, body: bytes):
+    """Compress a snapshot and replace ``path`` with it atomically."""
+    data = zlib.compress(body, 1)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as save_file:
+        save_file.write(_HEADER.pack(MAGIC, SAVE_VERSION, len(body)))
+        save_file.write(data)
+    os.replace(temp_path, path)
+
+
+def write_capture(path: str, state: Capture):
+    """Encode and write a ``Capture``; meant for a worker thread."""
+    write_snapshot(path, encode(state))
+
+
+def save_game(engine: Engine, path: str):
+    write_snapshot(path, snapshot(engine))
+
+
+def load_game(path: str, pregenerate: bool = True) -> Engine:
+    """Resume a dive from a save file."""
+    with open(path, 'rb') as save_file:
+        data = save_file.read()
+    if len(data) < _HEADER.size:
+        raise ValueError(f"Not a Terminus Veil save: {path}")
+    magic, version, length = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"Not a Terminus Veil save: {path}")
+    if version != SAVE_VERSION:
+        raise ValueError(f"Unsupported save version {version} (expected {SAVE_VERSION})")
+    try:
+        body = zlib.decompress(memoryview(data)[_HEADER.size:])
+    except zlib.error as error:
+        raise ValueError(f"Save file is corrupt: {error}") from error
+    if len(body) != length:
+        raise ValueError("Save file is truncated")
+    return restore_snapshot(body, pregenerate)
+
+
+def restore_snapshot(body: bytes, pregenerate: bool = True) -> Engine:
+    """Rebuild an engine from an uncompressed ``snapshot`` body."""
+    return _restore(_Reader(body), pregenerate)
+
+
+def _restore(reader: _Reader, pregenerate: bool) -> Engine:
+    seed, restarts, map_width, map_height = reader.unpack('QIII')
+    algorithm = reader.text()
+    game_state = GameState()
+    (game_state.current_level, game_state.game_over,
+     game_state.victory, game_state.score) = reader.unpack('I??q')
+    player_fields = reader.unpack('iiiii')
+    
+    data_points, item_kinds = reader.unpack('iI')
+    inventory = {}
+    for _ in range(item_kinds):
+        item_type = ItemType[reader.text()]
+        (inventory[item_type],) = reader.unpack('i')
+    
+    level_rng = LevelRNG(seed, game_state.current_level, restarts)
+    for stream in (level_rng.layout, level_rng.spawns, level_rng.combat):
+        _read_rng(reader, stream)
+    
+    width, height, start_x, start_y, exit_x, exit_y = reader.unpack('IIiiii')
+    tiles = TileGrid.from_codes(width, height, reader.blob())
+    explored = reader.blob()
+    if len(explored) != width * height:
+        raise ValueError("Save file has a mismatched explored mask")
+    distances = reader.array()
+    game_map = GameMap.from_grid(tiles, (start_x, start_y), (exit_x, exit_y), distances,
+                                 level_rng.layout, algorithm)
+    game_map.visibility_tracker.explored_grid[:] = explored
+    game_map.reserved = {(index % width, index // width) for index in reader.array()}
+    
+    (creature_kinds,) = reader.unpack('I')
+    # Saved creature code -> current code, as a translate table.
+    creature_codes = bytes(CREATURE_BY_TYPE[MonsterType[reader.text()]].code
+                           for _ in range(creature_kinds))
+    (count,) = reader.unpack('I')
+    store = MonsterStore()
+    for name in MonsterStore.COLUMNS:
+        column = reader.array()
+        if len(column) != count:
+            raise ValueError("Save file has mismatched creature columns")
+        setattr(store, name, column)
+    store.types = array('B', bytes(store.types).translate(creature_codes.ljust(256, b'\0')))
+    (time,) = reader.unpack('q')
+    flat_awake = reader.array()
+    awake = list(zip(flat_awake[::2], flat_awake[1::2]))
+    asleep = reader.array().tolist()
+    monster_manager = MonsterManager(level_rng.combat)
+    monster_manager.adopt_store(store, time, awake, asleep)
+    
+    (item_kinds,) = reader.unpack('I')
+    item_types = [ItemType[reader.text()] for _ in range(item_kinds)]
+    item_manager = ItemManager(level_rng.spawns)
+    (count,) = reader.unpack('I')
+    for _ in range(count):
+        x, y, code, value, is_collected = reader.unpack('iiBi?')
+        item = Item(x, y, item_types[code], value)
+        item.is_collected = is_collected
+        item_manager.add_item(item)
+    
+    level = Level(game_state.current_level, level_rng, game_map, monster_manager, item_manager)
+    engine = Engine(map_width, map_height, pregenerate, seed, algorithm,
+                    level=level, game_state=game_state)
+    engine.restarts = restarts
+    player = engine.player
+    player.x, player.y, player.hp, player.max_hp, player.attack_power = player_fields
+    player.inventory.data_points = data_points
+    player.inventory.items = inventory
+    engine.update_fov()
+    return engine
+
@@ -0,0 +1,144 @@
+"""Tile registry and compact tile grid for Terminus Veil."""
+
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the grid itself is a bytearray
+    np = None
+
+
+class TileType:
+    """A kind of terrain; its flags drive the grid's derived layers."""
+    
+    def __init__(self, char: str, name: str, walkable: bool, opaque: bool):
+        self.char = char
+        self.code = ord(char)
+        self.name = name
+        self.walkable = walkable
+        self.opaque = opaque
+
+
+WALL = TileType('#', 'rock', walkable=False, opaque=True)
+FLOOR = TileType('.', 'open water', walkable=True, opaque=False)
+EXIT = TileType('>', 'descent shaft', walkable=True, opaque=False)
+
+TILE_TYPES: Dict[int, TileType] = {}
+
+# 256-entry translation tables: tile code -> 0/1. Unknown codes are solid.
+_WALKABLE_TABLE = bytearray(256)
+_OPAQUE_TABLE = bytearray(b'\x01' * 256)
+
+
+def register_tile(tile_type: TileType):
+    """Add a terrain type to the registry."""
+    if not 0 < tile_type.code < 256:
+        raise ValueError(f"Tile character must fit in one byte: {tile_type.char!r}")
+    TILE_TYPES[tile_type.code] = tile_type
+    _WALKABLE_TABLE[tile_type.code] = tile_type.walkable
+    _OPAQUE_TABLE[tile_type.code] = tile_type.opaque
+
+
+for _tile_type in (WALL, FLOOR, EXIT):
+    register_tile(_tile_type)
+
+
+def encode_rows(rows: List[List[str]]) -> bytearray:
+    """Flatten a list-of-lists grid into row-major tile codes."""
+    return bytearray(''.join(''.join(row) for row in rows).encode('latin-1'))
+
+
+def walkable_layer(rows: List[List[str]]) -> bytearray:
+    """Row-major walkability (0/1) of a list-of-lists grid."""
+    return encode_rows(rows).translate(_WALKABLE_TABLE)
+
+
+class TileGrid:
+    """Map tiles as one uint8 code per cell, plus walkable and opaque layers.
+    
+    ``codes``, ``walkable`` and ``opaque`` are flat row-major bytearrays,
+    indexed by ``y * width + x``; the layers are derived from the tile
+    registry with a single ``translate`` pass. Indexing the grid yields
+    read-only rows, so ``grid[y][x]`` still returns the tile character.
+    Change tiles through ``set`` so the layers stay in step.
+    """
+    
+    def __init__(self, rows: List[List[str]]):
+        self.height = len(rows)
+        self.width = len(rows[0]) if rows else 0
+        self._load(encode_rows(rows))
+    
+    @classmethod
+    def from_codes(cls, width: int, height: int, codes: bytes) -> "TileGrid":
+        """A grid over existing row-major tile codes, e.g. from a save file."""
+        if len(codes) != width * height:
+            raise ValueError(f"Expected {width * height} tile codes, got {len(codes)}")
+        grid = cls.__new__(cls)
+        grid.width = width
+        grid.height = height
+        grid._load(bytearray(codes))
+        return grid
+    
+    def _load(self, codes: bytearray):
+        self.codes = codes
+        self.walkable = codes.translate(_WALKABLE_TABLE)
+        self.opaque = codes.translate(_OPAQUE_TABLE)
+        self._rows: List[Optional[str]] = [None] * self.height
+    
+    def __len__(self) -> int:
+        return self.height
+    
+    def __getitem__(self, y: int) -> str:
+        row = self._rows[y]
+        if row is None:
+            y %= self.height
+            start = y * self.width
+            row = self._rows[y] = self.codes[start:start + self.width].decode('latin-1')
+        return row
+    
+    def __iter__(self) -> Iterator[str]:
+        for y in range(self.height):
+            yield self[y]
+    
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+    
+    def get(self, x: int, y: int) -> str:
+        """Tile character at (x, y); rock outside the map."""
+        if self.in_bounds(x, y):
+            return chr(self.codes[y * self.width + x])
+        return WALL.char
+    
+    def tile_type(self, x: int, y: int) -> TileType:
+        if self.in_bounds(x, y):
+            return TILE_TYPES.get(self.codes[y * self.width + x], WALL)
+        return WALL
+    
+    def is_walkable(self, x: int, y: int) -> bool:
+        return self.in_bounds(x, y) and self.walkable[y * self.width + x] == 1
+    
+    def is_opaque(self, x: int, y: int) -> bool:
+        return not self.in_bounds(x, y) or self.opaque[y * self.width + x] == 1
+    
+    def set(self, x: int, y: int, char: str):
+        tile_type = TILE_TYPES.get(ord(char))
+        if tile_type is None:
+            raise ValueError(f"Unknown tile: {char!r}")
+        index = y * self.width + x
+        self.codes[index] = tile_type.code
+        self.walkable[index] = tile_type.walkable
+        self.opaque[index] = tile_type.opaque
+        self._rows[y] = None
+    
+    def to_lists(self) -> List[List[str]]:
+        return [list(row) for row in self]
+    
+    def as_array(self, layer: str = 'codes'):
+        """Read-only ``(height, width)`` uint8 NumPy view of ``codes``,
+        ``walkable`` or ``opaque``."""
+        if np is None:
+            raise ImportError("NumPy is required for TileGrid.as_array")
+        array = np.frombuffer(getattr(self, layer), dtype=np.uint8)
+        array = array.reshape(self.height, self.width)
+        array.flags.writeable = False
+        return array
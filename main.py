@@ -1,49 +1,33 @@
 """Main game file for Terminus Veil: Below the Surface."""
 
+import argparse
+import os
+from typing import Dict, List, Optional
+
+from rich.segment import Segment
+from rich.style import Style
+from rich.text import Text
 from textual.app import App, ComposeResult
+from textual.content import Content
 from textual.containers import Container, Horizontal, Vertical
+from textual.geometry import Region
+from textual.strip import Strip
+from textual.widget import Widget
 from textual.widgets import Static, Header, Footer
 from textual.binding import Binding
 
 from game.player import Player
-from game.game_map import GameMap
-from game.monster import MonsterManager
-from game.combat import CombatSystem, GameState
-from game.items import ItemManager, ItemType
-from game.fov import FOVCalculator, VisibilityTracker
-
-
-# Zone names for each depth level
-ZONE_NAMES = {
-    1: "Sunlight Zone",
-    2: "Twilight Zone",
-    3: "Midnight Zone",
-    4: "Abyssal Zone",
-    5: "Hadal Trench"
-}
+from game.combat import GameState
+from game.engine import Engine, get_zone_name
+from game.events import EventBus
+from game.renderer import Cell
+from game.replay import Recorder
+from game.save import load_game
+from game.dungeon_generator import DungeonGenerator
+from game.ascii_art import get_colored_char
 
-def get_zone_name(level: int) -> str:
-    """Return the zone name for a given depth level."""
-    return ZONE_NAMES.get(level, f"Depth {level}")
 
-
-class GameDisplay(Static):
-    """Widget to display the underwater map and diver."""
-    
-    def __init__(self, game_map: GameMap, player: Player, monster_manager: MonsterManager, 
-                 item_manager: ItemManager, game_state: GameState):
-        super().__init__()
-        self.game_map = game_map
-        self.player = player
-        self.monster_manager = monster_manager
-        self.item_manager = item_manager
-        self.game_state = game_state
-        self.update_display()
-    
-    def update_display(self):
-        """Update the display with current game state."""
-        if self.game_state and self.game_state.game_over:
-            game_over_text = """
+GAME_OVER_TEXT = """
 [bold red on black]
 ╔══════════════════════════════════════╗
 ║                                      ║
@@ -56,12 +40,95 @@ class GameDisplay(Static):
 ╚══════════════════════════════════════╝
 [/]
 """
-            self.update(game_over_text)
-        else:
-            map_str = self.game_map.render_with_entities(
-                self.player.x, self.player.y, self.monster_manager, self.item_manager
-            )
-            self.update(f"[white on black]{map_str}[/]")
+
+MAP_BASE_MARKUP = "[white on black]"
+
+
+def cells_to_strip(cells: List[Cell], styles: Dict[str, Style]) -> Strip:
+    """Build a Strip from renderer cells, merging runs that share a color.
+    
+    ``styles`` caches the parsed Style for each ColorScheme entry.
+    """
+    segments = []
+    run = []
+    run_color = None
+    for char, color in cells:
+        if color != run_color:
+            if run:
+                segments.append(Segment("".join(run), _cell_style(run_color, styles)))
+                run = []
+            run_color = color
+        run.append(char)
+    if run:
+        segments.append(Segment("".join(run), _cell_style(run_color, styles)))
+    return Strip(segments)
+
+
+def _cell_style(color: str, styles: Dict[str, Style]) -> Style:
+    style = styles.get(color)
+    if style is None:
+        # Resolve through Textual's markup so colors match the markup path.
+        cell = get_colored_char("x", color) if color else "x"
+        content = Content.from_markup(f"{MAP_BASE_MARKUP}{cell}[/]")
+        style = next(iter(content.render_segments())).style
+        styles[color] = style
+    return style
+
+
+class GameDisplay(Widget):
+    """Widget to display the underwater map and diver.
+    
+    Map rows are drawn through the line API from cached Strips, so no markup
+    is generated or parsed per turn. Only rows reported by the renderer's
+    frame diff are rebuilt and repainted. The renderer's viewport follows
+    the widget size, so large maps cost no more per turn than small ones.
+    """
+    
+    def __init__(self, engine: Engine):
+        super().__init__()
+        self.engine = engine
+        self._strips: List[Strip] = []
+        self._styles: Dict[str, Style] = {}
+        self._shown_renderer = None
+    
+    def on_resize(self) -> None:
+        self._shown_renderer = None
+        self.update_display()
+    
+    def update_display(self):
+        """Update the display with current game state."""
+        engine = self.engine
+        if engine.game_state.game_over:
+            if self._shown_renderer is not None or not self._strips:
+                text = Text.from_markup(GAME_OVER_TEXT)
+                self._strips = [Strip(line.render(self.app.console, end=""))
+                                for line in text.split("\n")]
+                self._shown_renderer = None
+                self.refresh(layout=True)
+            return
+        
+        if not self.size.area:
+            return
+        renderer = engine.game_map.renderer
+        renderer.set_viewport(self.size.width, self.size.height)
+        changed_rows = engine.game_map.render_frame_diff(
+            engine.player.x, engine.player.y, engine.monster_manager, engine.item_manager
+        )
+        if renderer is not self._shown_renderer or len(self._strips) != len(renderer.cells):
+            self._strips = [cells_to_strip(cells, self._styles) for cells in renderer.cells]
+            self._shown_renderer = renderer
+            self.refresh()
+            return
+        for y, cells in changed_rows.items():
+            self._strips[y] = cells_to_strip(cells, self._styles)
+            self.refresh(Region(0, y, self.size.width, 1))
+    
+    def render_line(self, y: int) -> Strip:
+        rich_style = self.rich_style
+        width = self.size.width
+        if y >= len(self._strips):
+            return Strip.blank(width, rich_style)
+        return self._strips[y].crop_extend(0, width, rich_style).apply_style(rich_style)
 
 
 class StatusDisplay(Static):
@@ -92,16 +159,19 @@ Score: {self.game_state.score}
 
 
 class MessageDisplay(Static):
-    """Widget to display dive log messages."""
+    """Widget to display dive log messages.
+    
+    Log events are only formatted here, when they are shown.
+    """
     
-    def __init__(self, combat_system: CombatSystem):
+    def __init__(self, events: EventBus):
         super().__init__()
-        self.combat_system = combat_system
+        self.events = events
         self.update_messages()
     
     def update_messages(self):
         """Update the message display."""
-        messages = self.combat_system.get_recent_messages(5)
+        messages = self.events.recent_messages(5)
         if messages:
             message_text = "\n".join(messages)
         else:
@@ -147,7 +217,8 @@ class RoguelikeApp(App):
     
     GameDisplay {
         text-style: bold;
-        overflow: auto;
+        width: 100%;
+        height: 100%;
     }
     """
     
@@ -163,198 +234,66 @@ class RoguelikeApp(App):
         Binding("2", "use_flare", "Use Signal Flare"),
     ]
     
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None, map_width: int = 80,
+                 map_height: int = 40, map_algorithm: str = 'bsp',
+                 save_path: Optional[str] = None, record_path: Optional[str] = None):
         super().__init__()
-        self._initialize_game()
+        resumed = bool(save_path) and os.path.exists(save_path)
+        if resumed:
+            self.engine = load_game(save_path)
+            self.engine.autosave_path = save_path
+        else:
+            self.engine = Engine(map_width, map_height, seed=seed, map_algorithm=map_algorithm,
+                                 autosave_path=save_path)
+        self.recorder = Recorder(self.engine, record_path, resumed) if record_path else None
     
-    def _initialize_game(self):
-        """Initialize or restart the dive."""
-        self.game_map = GameMap()
-        start_x, start_y = self.game_map.player_start
-        self.player = Player(start_x, start_y)
-        
-        self.monster_manager = MonsterManager()
-        self.combat_system = CombatSystem()
-        self.game_state = GameState()
-        self.item_manager = ItemManager()
-        
-        self.game_map.place_exit()
-        
-        monster_count = self.game_state.get_monster_count_for_level()
-        item_count = self.game_state.get_item_count_for_level()
-        
-        self.monster_manager.spawn_monsters(self.game_map.tiles, monster_count, 
-                                          self.game_state.current_level)
-        self.item_manager.spawn_items(self.game_map.tiles, item_count)
-        
-        self.game_map.fov_calculator = FOVCalculator(self.game_map.tiles)
-        self.game_map.visibility_tracker = VisibilityTracker()
-        self.game_map.update_fov(self.player.x, self.player.y, self.game_state.current_level)
+    def on_unmount(self) -> None:
+        if self.recorder:
+            self.recorder.close()
+        self.engine.autosave()
+        self.engine.close()
     
-    def _advance_to_next_level(self):
-        """Descend to the next depth."""
-        self.game_state.advance_level()
-        
-        self.game_map = GameMap()
-        start_x, start_y = self.game_map.player_start
-        self.player.x = start_x
-        self.player.y = start_y
-        
-        self.monster_manager = MonsterManager()
-        self.item_manager = ItemManager()
-        
-        self.game_map.place_exit()
-        
-        monster_count = self.game_state.get_monster_count_for_level()
-        item_count = self.game_state.get_item_count_for_level()
-        
-        self.monster_manager.spawn_monsters(self.game_map.tiles, monster_count, 
-                                          self.game_state.current_level)
-        self.item_manager.spawn_items(self.game_map.tiles, item_count)
-        
-        self.game_map.fov_calculator = FOVCalculator(self.game_map.tiles)
-        self.game_map.visibility_tracker = VisibilityTracker()
-        self.game_map.update_fov(self.player.x, self.player.y, self.game_state.current_level)
-        
-        game_display = self.query_one(GameDisplay)
-        game_display.game_map = self.game_map
-        game_display.player = self.player
-        game_display.monster_manager = self.monster_manager
-        game_display.item_manager = self.item_manager
-        game_display.game_state = self.game_state
-        
-        zone = get_zone_name(self.game_state.current_level)
-        self.combat_system.combat_log.append(f"You descend into the {zone}!")
-        self.combat_system.combat_log.append("The pressure increases...")
-        
     def compose(self) -> ComposeResult:
         yield Header()
         with Horizontal():
             with Container(id="game_area"):
-                yield GameDisplay(self.game_map, self.player, self.monster_manager, 
-                                self.item_manager, self.game_state)
+                yield GameDisplay(self.engine)
             with Container(id="info_area"):
                 with Container(id="status_area"):
-                    yield StatusDisplay(self.player, self.game_state)
+                    yield StatusDisplay(self.engine.player, self.engine.game_state)
                 with Container(id="message_area"):
-                    yield MessageDisplay(self.combat_system)
+                    yield MessageDisplay(self.engine.events)
         yield Footer()
     
     def action_move_up(self) -> None:
-        self._try_move(0, -1)
+        self._perform("move_up")
     
     def action_move_down(self) -> None:
-        self._try_move(0, 1)
+        self._perform("move_down")
     
     def action_move_left(self) -> None:
-        self._try_move(-1, 0)
+        self._perform("move_left")
     
     def action_move_right(self) -> None:
-        self._try_move(1, 0)
+        self._perform("move_right")
     
     def action_restart(self) -> None:
-        current_level = self.game_state.current_level
-        
-        self.game_map = GameMap()
-        start_x, start_y = self.game_map.player_start
-        self.player.x = start_x
-        self.player.y = start_y
-        self.player.hp = self.player.max_hp
-        
-        self.monster_manager = MonsterManager()
-        self.item_manager = ItemManager()
-        
-        self.game_state.game_over = False
-        self.game_state.victory = False
-        self.game_state.current_level = current_level
-        
-        self.game_map.place_exit()
-        
-        monster_count = self.game_state.get_monster_count_for_level()
-        item_count = self.game_state.get_item_count_for_level()
-        
-        self.monster_manager.spawn_monsters(self.game_map.tiles, monster_count, 
-                                          self.game_state.current_level)
-        self.item_manager.spawn_items(self.game_map.tiles, item_count)
-        
-        self.game_map.fov_calculator = FOVCalculator(self.game_map.tiles)
-        self.game_map.visibility_tracker = VisibilityTracker()
-        self.game_map.update_fov(self.player.x, self.player.y, self.game_state.current_level)
-        
-        game_display = self.query_one(GameDisplay)
-        game_display.game_map = self.game_map
-        game_display.player = self.player
-        game_display.monster_manager = self.monster_manager
-        game_display.item_manager = self.item_manager
-        game_display.game_state = self.game_state
-        
-        self.combat_system.clear_log()
-        zone = get_zone_name(current_level)
-        self.combat_system.combat_log.append(f"Return to the {zone}.")
-        
-        self.refresh()
-        self._update_displays()
+        self._perform("restart")
     
     def action_use_item(self) -> None:
-        self.action_use_oxygentank()
+        self._perform("use_item")
     
     def action_use_oxygentank(self) -> None:
-        result = self.player.inventory.use_item(ItemType.OXYGEN_TANK, self.player)
-        if result:
-            self.combat_system.combat_log.append(result)
-        else:
-            self.combat_system.combat_log.append("No oxygen tanks available!")
-        self._update_displays()
+        self._perform("use_oxygentank")
     
     def action_use_flare(self) -> None:
-        result = self.player.inventory.use_item(ItemType.SIGNAL_FLARE, self.player)
-        if result:
-            self.combat_system.combat_log.append(result)
-        else:
-            self.combat_system.combat_log.append("No signal flares available!")
-        self._update_displays()
+        self._perform("use_flare")
     
-    def _try_move(self, dx: int, dy: int):
-        if self.game_state.game_over:
-            return
-        
-        new_x = self.player.x + dx
-        new_y = self.player.y + dy
-        
-        target_monster = self.monster_manager.get_monster_at(new_x, new_y)
-        
-        if target_monster and target_monster.is_alive:
-            combat_messages = self.combat_system.player_attack_monster(
-                self.player, target_monster
-            )
-            turn_messages = self.combat_system.process_turn(
-                self.player, self.monster_manager, self.game_map.tiles, 
-                self.game_map.visibility_tracker
-            )
-        elif self.player.move(dx, dy, self.game_map.tiles):
-            item = self.item_manager.collect_item(self.player.x, self.player.y)
-            if item:
-                pickup_message = self.player.inventory.add_item(item)
-                self.combat_system.combat_log.append(pickup_message)
-            
-            if self.game_state.check_victory_condition(
-                self.player.x, self.player.y, self.game_map.tiles
-            ):
-                self._advance_to_next_level()
-                self._update_displays()
-                return
-            
-            turn_messages = self.combat_system.process_turn(
-                self.player, self.monster_manager, self.game_map.tiles, 
-                self.game_map.visibility_tracker
-            )
-        
-        self.game_state.check_defeat_condition(self.player)
+    def _perform(self, action: str) -> None:
+        self.engine.perform(action)
         self._update_displays()
     
     def _update_displays(self) -> None:
-        self.game_map.update_fov(self.player.x, self.player.y, self.game_state.current_level)
-        
         game_display = self.query_one(GameDisplay)
         status_display = self.query_one(StatusDisplay)
         message_display = self.query_one(MessageDisplay)
@@ -365,7 +304,21 @@ class RoguelikeApp(App):
 
 
 def main():
-    app = RoguelikeApp()
+    parser = argparse.ArgumentParser(description="Terminus Veil: Below the Surface")
+    parser.add_argument("--seed", type=int, help="run seed, for a reproducible dive")
+    parser.add_argument("--width", type=int, default=80, help="map width in tiles")
+    parser.add_argument("--height", type=int, default=40, help="map height in tiles")
+    parser.add_argument("--algorithm", default="bsp",
+                        choices=sorted(DungeonGenerator.ALGORITHMS),
+                        help="cave generation algorithm")
+    parser.add_argument("--save", metavar="PATH",
+                        help="resume the dive saved at PATH, and save it there at "
+                             "every descent and on quit")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record every action to PATH for python -m game.replay")
+    args = parser.parse_args()
+    app = RoguelikeApp(args.seed, args.width, args.height, args.algorithm, args.save,
+                       args.record)
     app.run()
 
 
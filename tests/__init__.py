@@ -0,0 +1 @@
+# Tests for Terminus Veil: Below the Surface
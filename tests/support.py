@@ -0,0 +1,28 @@
+"""Helpers shared by the save and replay tests."""
+
+import os
+import random
+import tempfile
+import unittest
+
+from game.engine import Engine
+
+
+def play(engine: Engine, turns: int, seed: int):
+    """Take ``turns`` random actions, chosen from a stream seeded with ``seed``."""
+    rng = random.Random(seed)
+    for _ in range(turns):
+        engine.perform(rng.choice(Engine.ACTIONS))
+
+
+class TempDirTestCase(unittest.TestCase):
+    """Gives each test a fresh ``directory`` and a ``path`` named ``filename`` in it."""
+    
+    filename = "dive"
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, self.filename)
+    
+    def tearDown(self):
+        self.directory.cleanup()
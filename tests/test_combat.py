@@ -0,0 +1,122 @@
+"""Typed creature actions and the events each one resolves to.
+
+    python -m unittest tests.test_combat
+"""
+
+import random
+import unittest
+
+from game.actions import AttackAction, IdleAction, MoveAction
+from game.combat import CombatSystem
+from game.content import ItemType, MonsterType
+from game.engine import MOVES, Engine
+from game.events import EventType
+from game.game_map import GameMap
+from game.monster import Monster, MonsterManager
+from game.player import Player
+
+
+class CreatureActionTest(unittest.TestCase):
+    """One leviathan (speed 100) near a diver at (3, 3) on the simple map."""
+    
+    def setUp(self):
+        self.game_map = GameMap(40, 20, use_procedural=False, rng=random.Random(1))
+        self.player = Player(3, 3)
+        self.manager = MonsterManager(random.Random(2))
+        self.combat = CombatSystem(random.Random(3))
+    
+    def add(self, x: int, y: int) -> Monster:
+        monster = Monster(x, y, MonsterType.LEVIATHAN)
+        self.manager.add_monster(monster)
+        return monster
+    
+    def turn(self, visible: bool = True):
+        if visible:
+            self.game_map.update_fov(self.player.x, self.player.y)
+        return self.combat.process_turn(self.player, self.manager, self.game_map.tiles,
+                                        self.game_map.visibility_tracker)
+    
+    def actions(self):
+        self.game_map.update_fov(self.player.x, self.player.y)
+        return list(self.manager.take_turns(self.player.x, self.player.y, self.game_map.tiles,
+                                            self.game_map.visibility_tracker))
+    
+    def test_adjacent_creature_attacks_once(self):
+        monster = self.add(4, 3)
+        self.assertEqual([type(action) for action in self.actions()], [AttackAction])
+        hp = self.player.hp
+        events = self.turn()
+        self.assertEqual([event.event_type for event in events], [EventType.DAMAGE])
+        damage = events[0].fields['damage']
+        self.assertEqual(self.player.hp, hp - damage)
+        self.assertEqual(events[0].fields['hp'], self.player.hp)
+        self.assertIn(monster.name, events[0].message)
+    
+    def test_creature_in_sight_moves_closer(self):
+        monster = self.add(7, 3)
+        self.assertEqual([type(action) for action in self.actions()], [MoveAction])
+        events = self.turn()
+        self.assertEqual([event.event_type for event in events], [EventType.CREATURE_MOVE])
+        self.assertEqual(monster.x, 6)
+        self.assertIs(self.manager.get_monster_at(monster.x, monster.y), monster)
+        self.assertIsNone(self.manager.get_monster_at(7, 3))
+    
+    def test_creature_out_of_sight_idles_silently(self):
+        monster = self.add(3, 8)
+        self.game_map.visibility_tracker.update_visibility(set())
+        actions = list(self.manager.take_turns(3, 3, self.game_map.tiles,
+                                               self.game_map.visibility_tracker))
+        self.assertEqual([type(action) for action in actions], [IdleAction])
+        self.assertEqual(self.turn(visible=False), [])
+        self.assertEqual((monster.x, monster.y), (3, 8))
+    
+    def test_diver_attack_reports_damage_and_death(self):
+        monster = self.add(4, 3)
+        events = self.combat.player_attack_monster(self.player, monster)
+        self.assertEqual([event.event_type for event in events],
+                         [EventType.ATTACK, EventType.MESSAGE])
+        self.assertEqual(monster.hp, monster.max_hp - events[0].fields['damage'])
+        monster.hp = 1
+        events = self.combat.player_attack_monster(self.player, monster)
+        self.assertEqual([event.event_type for event in events],
+                         [EventType.ATTACK, EventType.DEATH])
+        self.assertFalse(monster.is_alive)
+
+
+class DiverActionTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = Engine(pregenerate=False, seed=21)
+        self.addCleanup(self.engine.close)
+    
+    def test_move_into_rock_is_blocked(self):
+        engine = self.engine
+        game_map = engine.game_map
+        x, y, action = next(
+            (cell % game_map.width, cell // game_map.width, name)
+            for cell in game_map.floor_tiles for name, (dx, dy) in MOVES.items()
+            if not game_map.is_walkable(cell % game_map.width + dx, cell // game_map.width + dy))
+        engine.player.x, engine.player.y = x, y
+        time = engine.monster_manager.time
+        events = engine.perform(action)
+        self.assertEqual([event.event_type for event in events], [EventType.BLOCKED])
+        self.assertEqual((engine.player.x, engine.player.y), (x, y))
+        self.assertEqual(engine.monster_manager.time, time)
+    
+    def test_using_an_oxygen_tank(self):
+        player = self.engine.player
+        player.hp = player.max_hp - 30
+        player.inventory.items[ItemType.OXYGEN_TANK] = 1
+        events = self.engine.perform('use_oxygentank')
+        self.assertEqual([event.event_type for event in events], [EventType.ITEM_USED])
+        self.assertIn("25", events[0].message)
+        self.assertEqual(player.hp, player.max_hp - 5)
+        self.assertEqual(player.inventory.get_item_count(ItemType.OXYGEN_TANK), 0)
+    
+    def test_using_a_missing_item(self):
+        events = self.engine.perform('use_flare')
+        self.assertEqual([event.event_type for event in events], [EventType.MESSAGE])
+        self.assertEqual(events[0].message, "No signal flares available!")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Region repair and distance maps of the dungeon generator.
+
+    python -m unittest tests.test_dungeon_generator
+"""
+
+import random
+import unittest
+
+from game import dungeon_generator
+from game.dungeon_generator import DungeonGenerator
+from game.tiles import TileGrid
+
+SEEDS = range(6)
+SIZES = [(80, 40), (157, 93)]
+
+
+def open_cells(dungeon):
+    return [(x, y) for y, row in enumerate(dungeon) for x, char in enumerate(row) if char != '#']
+
+
+class ConnectRegionsTest(unittest.TestCase):
+    def connected(self, width: int, height: int, algorithm: str, seed: int):
+        generator = DungeonGenerator(width, height, random.Random(seed))
+        dungeon = generator.generate(algorithm)
+        generator.connect_regions(dungeon)
+        return generator, dungeon
+    
+    def test_every_open_cell_is_reachable(self):
+        for algorithm in ('bsp', 'cave'):
+            for width, height in SIZES:
+                for seed in SEEDS:
+                    with self.subTest(algorithm=algorithm, size=(width, height), seed=seed):
+                        generator, dungeon = self.connected(width, height, algorithm, seed)
+                        cells = open_cells(dungeon)
+                        self.assertTrue(cells)
+                        labels, sizes = generator.label_regions(dungeon)
+                        self.assertEqual(len(sizes), 1)
+                        distances = generator.distance_map(TileGrid(dungeon), cells[0])
+                        unreachable = [(x, y) for x, y in cells if distances[y * width + x] < 0]
+                        self.assertEqual(unreachable, [])
+    
+    def test_border_stays_solid(self):
+        for algorithm in ('bsp', 'cave'):
+            for seed in SEEDS:
+                with self.subTest(algorithm=algorithm, seed=seed):
+                    _, dungeon = self.connected(80, 40, algorithm, seed)
+                    self.assertEqual(set(dungeon[0]) | set(dungeon[-1]), {'#'})
+                    self.assertEqual({row[0] for row in dungeon} | {row[-1] for row in dungeon},
+                                     {'#'})
+    
+    @unittest.skipIf(dungeon_generator.np is None, "NumPy is not installed")
+    def test_numpy_matches_pure_python(self):
+        numpy = dungeon_generator.np
+        for seed in SEEDS:
+            with self.subTest(seed=seed):
+                generator = DungeonGenerator(120, 60, random.Random(seed))
+                raw = generator.generate('cave')
+                results = []
+                for module in (numpy, None):
+                    dungeon_generator.np = module
+                    try:
+                        dungeon = [row[:] for row in raw]
+                        generator.connect_regions(dungeon)
+                        start = open_cells(dungeon)[0]
+                        results.append((dungeon, generator.label_regions(dungeon),
+                                        generator.distance_map(TileGrid(dungeon), start)))
+                    finally:
+                        dungeon_generator.np = numpy
+                self.assertEqual(results[0], results[1])
+
+
+@unittest.skipIf(dungeon_generator.np is None, "NumPy is not installed")
+class CaveGeneratorTest(unittest.TestCase):
+    def test_numpy_and_pure_python_caves_match(self):
+        numpy = dungeon_generator.np
+        for width, height in SIZES + [(3, 3), (2, 6)]:
+            for seed in SEEDS:
+                with self.subTest(size=(width, height), seed=seed):
+                    results = []
+                    for module in (numpy, None):
+                        dungeon_generator.np = module
+                        try:
+                            generator = DungeonGenerator(width, height, random.Random(seed))
+                            results.append((generator.generate('cave'), generator.rng.random()))
+                        finally:
+                            dungeon_generator.np = numpy
+                    self.assertEqual(results[0], results[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Symmetric shadowcasting field of view.
+
+    python -m unittest tests.test_fov
+"""
+
+import random
+import unittest
+
+from game.fov import FOVCalculator, VisibilityTracker
+from game.game_map import GameMap
+
+RADIUS = 8
+
+
+class ShadowcastTest(unittest.TestCase):
+    def maps(self):
+        yield GameMap(80, 40, use_procedural=False, rng=random.Random(1))
+        for algorithm in ('bsp', 'cave'):
+            for seed in range(3):
+                yield GameMap(80, 40, rng=random.Random(seed), algorithm=algorithm)
+    
+    def test_floor_visibility_is_symmetric(self):
+        for game_map in self.maps():
+            calculator = FOVCalculator(game_map.tiles, cache_size=4096)
+            rng = random.Random(5)
+            one_way = []
+            for cell in rng.sample(game_map.floor_tiles, 25):
+                origin = (cell % game_map.width, cell // game_map.width)
+                for target in calculator.calculate(*origin, RADIUS):
+                    if (game_map.tiles.is_walkable(*target) and
+                            origin not in calculator.calculate(*target, RADIUS)):
+                        one_way.append((origin, target))
+            self.assertEqual(one_way, [], game_map.algorithm)
+    
+    def test_walls_next_to_the_viewer_are_visible(self):
+        game_map = GameMap(80, 40, use_procedural=False, rng=random.Random(1))
+        visible = FOVCalculator(game_map.tiles).calculate(11, 7, RADIUS)
+        self.assertIn((10, 7), visible)
+        self.assertIn((16, 10), visible)
+        self.assertNotIn((9, 7), visible)
+    
+    def test_radius_bounds_the_view(self):
+        game_map = GameMap(80, 40, use_procedural=False, rng=random.Random(1))
+        visible = FOVCalculator(game_map.tiles).calculate(40, 25, RADIUS)
+        self.assertIn((40 + RADIUS, 25), visible)
+        for x, y in visible:
+            self.assertLessEqual((x - 40) ** 2 + (y - 25) ** 2, RADIUS * RADIUS)
+
+
+class VisibilityTrackerTest(unittest.TestCase):
+    def test_newly_explored_lists_first_sightings_in_scan_order(self):
+        tracker = VisibilityTracker(20, 10)
+        self.assertEqual(tracker.drain_newly_explored(), [])
+        tracker.update_visibility({(5, 5), (4, 5), (5, 4)})
+        self.assertEqual(tracker.newly_explored, [(5, 4), (4, 5), (5, 5)])
+        tracker.update_visibility({(5, 5), (6, 5), (19, 9), (20, 9), (-1, 0)})
+        self.assertEqual(tracker.newly_explored, [(6, 5), (19, 9)])
+        self.assertEqual(tracker.visible, {(5, 5), (6, 5), (19, 9)})
+        self.assertFalse(tracker.is_visible(4, 5))
+        self.assertTrue(tracker.is_explored(4, 5))
+        self.assertEqual(tracker.drain_newly_explored(),
+                         [(5, 4), (4, 5), (5, 5), (6, 5), (19, 9)])
+        self.assertEqual(tracker.drain_newly_explored(), [])
+    
+    def test_nothing_is_queued_without_a_consumer(self):
+        tracker = VisibilityTracker(50, 50)
+        for x in range(1, 49):
+            tracker.update_visibility({(x, 10), (x, 11)})
+        self.assertIsNone(tracker._pending_explored)
+        self.assertEqual(tracker.newly_explored, [(48, 10), (48, 11)])
+        self.assertEqual(tracker.drain_newly_explored(), [])
+        tracker.update_visibility({(5, 20)})
+        self.assertEqual(tracker.drain_newly_explored(), [(5, 20)])
+    
+    def test_tracker_without_dimensions_grows(self):
+        tracker = VisibilityTracker()
+        tracker.update_visibility({(1, 1), (2, 1)})
+        tracker.update_visibility({(30, 12), (2, 1)})
+        self.assertEqual(tracker.visible, {(30, 12), (2, 1)})
+        self.assertEqual(tracker.explored, {(1, 1), (2, 1), (30, 12)})
+        self.assertEqual(tracker.newly_explored, [(30, 12)])
+        self.assertFalse(tracker.is_explored(40, 40))
+
+
+if __name__ == "__main__":
+    unittest.main()
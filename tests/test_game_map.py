@@ -0,0 +1,70 @@
+"""Floor index and distance map upkeep of GameMap.
+
+    python -m unittest tests.test_game_map
+"""
+
+import random
+import unittest
+
+from game.game_map import GameMap
+from game.tiles import FLOOR
+
+
+def indexed_floor(game_map: GameMap):
+    return {index for index, code in enumerate(game_map.tiles.codes) if code == FLOOR.code}
+
+
+def position(game_map: GameMap, cell: int):
+    return cell % game_map.width, cell // game_map.width
+
+
+class FloorIndexTest(unittest.TestCase):
+    def test_set_tile_keeps_floor_tiles_in_step(self):
+        game_map = GameMap(80, 40, rng=random.Random(3), algorithm='cave')
+        rng = random.Random(4)
+        walls = [(x, y) for y in range(1, 39) for x in range(1, 79)
+                 if not game_map.is_walkable(x, y)]
+        for cell in rng.sample(game_map.floor_tiles, 200):
+            game_map.set_tile(*position(game_map, cell), '#')
+        for wall in rng.sample(walls, 100):
+            game_map.set_tile(*wall, '.')
+        game_map.set_tile(*position(game_map, game_map.floor_tiles[0]), '#')
+        game_map.set_tile(*position(game_map, game_map.floor_tiles[-1]), '#')
+        self.assertEqual(len(game_map.floor_tiles), len(set(game_map.floor_tiles)))
+        self.assertEqual(set(game_map.floor_tiles), indexed_floor(game_map))
+        slots = game_map._floor_index()
+        for slot, cell in enumerate(game_map.floor_tiles):
+            self.assertEqual(slots[cell], slot)
+        self.assertEqual(sum(slot >= 0 for slot in slots), len(game_map.floor_tiles))
+    
+    def test_set_tile_updates_distances(self):
+        game_map = GameMap(80, 40, use_procedural=False, rng=random.Random(1))
+        start_x, start_y = game_map.player_start
+        target = next((x, y) for x, y in ((start_x + 1, start_y), (start_x - 1, start_y),
+                                          (start_x, start_y + 1), (start_x, start_y - 1))
+                      if game_map.is_walkable(x, y))
+        self.assertEqual(game_map.distance_to_start(*target), 1)
+        game_map.set_tile(*target, '#')
+        self.assertEqual(game_map.distance_to_start(*target), -1)
+        cell = target[1] * game_map.width + target[0]
+        self.assertNotIn(cell, game_map.floor_tiles)
+        game_map.set_tile(*target, '.')
+        self.assertEqual(game_map.distance_to_start(*target), 1)
+        self.assertIn(cell, game_map.floor_tiles)
+
+    
+    def test_distances_match_a_fresh_search_after_edits(self):
+        for algorithm in ('bsp', 'cave'):
+            with self.subTest(algorithm=algorithm):
+                game_map = GameMap(80, 40, rng=random.Random(5), algorithm=algorithm)
+                rng = random.Random(6)
+                for _ in range(150):
+                    x, y = rng.randrange(1, 79), rng.randrange(1, 39)
+                    if (x, y) != game_map.player_start:
+                        game_map.set_tile(x, y, '#' if game_map.is_walkable(x, y) else '.')
+                expected = game_map.generator.distance_map(game_map.tiles, game_map.player_start)
+                self.assertEqual(game_map.distance_from_start, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
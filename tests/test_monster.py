@@ -0,0 +1,141 @@
+"""Creature storage in MonsterStore and MonsterManager.
+
+    python -m unittest tests.test_monster
+"""
+
+import random
+import unittest
+
+from game.content import MonsterType
+from game.fov import VisibilityTracker
+from game.monster import WAKE_RADIUS, Monster, MonsterManager, MonsterStore
+
+
+def make_manager(count: int) -> MonsterManager:
+    manager = MonsterManager(random.Random(1))
+    kinds = list(MonsterType)
+    for index in range(count):
+        monster = Monster(index, 2 * index, kinds[index % len(kinds)])
+        monster.hp = 10 + index
+        manager.add_monster(monster)
+    return manager
+
+
+class SwapRemoveTest(unittest.TestCase):
+    def assert_dense(self, store: MonsterStore):
+        for name in MonsterStore.COLUMNS:
+            self.assertEqual(len(getattr(store, name)), len(store))
+        for slot, view in enumerate(store.views):
+            self.assertIs(view._store, store)
+            self.assertEqual(view._slot, slot)
+    
+    def test_last_slot_fills_the_hole(self):
+        manager = make_manager(5)
+        store = manager.store
+        last = store.views[4]
+        store.swap_remove(1)
+        self.assert_dense(store)
+        self.assertEqual(len(store), 4)
+        self.assertIs(store.views[1], last)
+        self.assertEqual((last.x, last.y, last.hp), (4, 8, 14))
+        self.assertEqual([view.x for view in store.views], [0, 4, 2, 3])
+    
+    def test_removed_view_keeps_its_row(self):
+        manager = make_manager(3)
+        store = manager.store
+        removed = store.views[0]
+        row = store.row(0)
+        store.swap_remove(0)
+        self.assertIsNot(removed._store, store)
+        self.assertEqual(removed._store.row(removed._slot), row)
+        removed.hp = 1
+        self.assertNotIn(1, store.hps)
+    
+    def test_removing_the_last_slot(self):
+        manager = make_manager(3)
+        store = manager.store
+        store.swap_remove(2)
+        self.assert_dense(store)
+        self.assertEqual([view.x for view in store.views], [0, 1])
+    
+    def test_dead_creatures_leave_the_store_and_the_position_index(self):
+        manager = make_manager(6)
+        victims = [manager.store.views[0], manager.store.views[3], manager.store.views[5]]
+        for monster in victims:
+            self.assertTrue(monster.take_damage(1000))
+        manager.remove_dead_monsters()
+        self.assert_dense(manager.store)
+        self.assertEqual(sorted(view.x for view in manager.store.views), [1, 2, 4])
+        for monster in victims:
+            self.assertIsNone(manager.get_monster_at(monster.x, monster.y))
+        for view in manager.store.views:
+            self.assertIs(manager.get_monster_at(view.x, view.y), view)
+
+
+
+class SchedulerTest(unittest.TestCase):
+    """Creatures out of sight idle, so every action yielded is one turn taken."""
+    
+    PLAYER = (50, 50)
+    
+    def turns_taken(self, manager: MonsterManager, turns: int):
+        tracker = VisibilityTracker(100, 100)
+        counts = {monster: 0 for monster in manager.store.views}
+        for _ in range(turns):
+            for action in manager.take_turns(*self.PLAYER, None, tracker):
+                counts[action.monster] += 1
+        return counts
+    
+    def test_speed_sets_how_often_a_creature_acts(self):
+        manager = MonsterManager(random.Random(1))
+        jellyfish = Monster(52, 50, MonsterType.JELLYFISH)
+        anglerfish = Monster(48, 50, MonsterType.ANGLERFISH)
+        leviathan = Monster(50, 53, MonsterType.LEVIATHAN)
+        for monster in (jellyfish, anglerfish, leviathan):
+            manager.add_monster(monster)
+        turns = 60
+        counts = self.turns_taken(manager, turns)
+        self.assertAlmostEqual(counts[jellyfish] / turns, 0.5, delta=0.05)
+        self.assertAlmostEqual(counts[anglerfish] / turns, 1.5, delta=0.05)
+        self.assertAlmostEqual(counts[leviathan] / turns, 1.0, delta=0.05)
+    
+    def test_jellyfish_act_every_other_turn(self):
+        manager = MonsterManager(random.Random(1))
+        manager.add_monster(Monster(52, 50, MonsterType.JELLYFISH))
+        tracker = VisibilityTracker(100, 100)
+        acted = [len(list(manager.take_turns(*self.PLAYER, None, tracker))) for _ in range(8)]
+        self.assertEqual(acted, [1, 0, 1, 0, 1, 0, 1, 0])
+    
+    def test_only_creatures_within_wake_radius_wake(self):
+        manager = MonsterManager(random.Random(1))
+        x, y = self.PLAYER
+        near = Monster(x + WAKE_RADIUS, y, MonsterType.LEVIATHAN)
+        far = Monster(x + WAKE_RADIUS + 1, y, MonsterType.LEVIATHAN)
+        diagonal = Monster(x + 9, y + 9, MonsterType.LEVIATHAN)   # 12.7 tiles away
+        for monster in (near, far, diagonal):
+            manager.add_monster(monster)
+        self.assertEqual(manager.awake_count, 0)
+        counts = self.turns_taken(manager, 5)
+        self.assertEqual(counts[near], 5)
+        self.assertEqual(counts[far], 0)
+        self.assertEqual(counts[diagonal], 0)
+        self.assertEqual(manager.awake_count, 1)
+    
+    def test_creatures_left_behind_fall_asleep(self):
+        manager = MonsterManager(random.Random(1))
+        x, y = self.PLAYER
+        monster = Monster(x + 3, y, MonsterType.LEVIATHAN)
+        manager.add_monster(monster)
+        self.turns_taken(manager, 2)
+        self.assertEqual(manager.awake_count, 1)
+        tracker = VisibilityTracker(100, 100)
+        list(manager.take_turns(x - 20, y, None, tracker))
+        self.assertEqual(manager.awake_count, 0)
+        acted = list(manager.take_turns(x - 20, y, None, tracker))
+        self.assertEqual(acted, [])
+        acted = list(manager.take_turns(x + 5, y, None, tracker))
+        self.assertEqual([action.monster for action in acted], [monster])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""Terrain cells drawn by the map renderer.
+
+    python -m unittest tests.test_renderer
+"""
+
+import random
+import unittest
+
+from game.ascii_art import ASCIIChars, ColorScheme
+from game.game_map import GameMap
+from game.renderer import cells_to_markup
+
+
+class WallRenderingTest(unittest.TestCase):
+    def render(self, game_map: GameMap, x: int, y: int):
+        game_map.update_fov(x, y)
+        game_map.render_with_entities(x, y)
+        return game_map.renderer.cells
+    
+    def assert_walls_drawn(self, game_map: GameMap, x: int, y: int):
+        cells = self.render(game_map, x, y)
+        tiles = game_map.tiles
+        visible_walls = 0
+        for index in game_map.visibility_tracker.visible_indices:
+            cx, cy = index % game_map.width, index // game_map.width
+            if tiles.opaque[index]:
+                visible_walls += 1
+                self.assertEqual(cells[cy][cx],
+                                 (game_map.wall_renderer.row_glyphs(cy)[cx], ColorScheme.WALL))
+            elif (cx, cy) != (x, y):
+                self.assertEqual(cells[cy][cx], (ASCIIChars.FLOOR, ColorScheme.FLOOR))
+        self.assertGreater(visible_walls, 0)
+    
+    def test_visible_walls_keep_their_glyph(self):
+        game_map = GameMap(80, 40, use_procedural=False, rng=random.Random(1))
+        self.assert_walls_drawn(game_map, 12, 8)
+    
+    def test_visible_walls_on_generated_maps(self):
+        for algorithm in ('bsp', 'cave'):
+            with self.subTest(algorithm=algorithm):
+                game_map = GameMap(80, 40, rng=random.Random(7), algorithm=algorithm)
+                self.assert_walls_drawn(game_map, *game_map.player_start)
+    
+    def test_walls_stay_walls_once_out_of_sight(self):
+        game_map = GameMap(80, 40, use_procedural=False, rng=random.Random(1))
+        self.render(game_map, 12, 8)
+        cells = self.render(game_map, 60, 30)
+        self.assertEqual(cells[8][10],
+                         (game_map.wall_renderer.row_glyphs(8)[10], ColorScheme.WALL))
+
+
+
+class LazyMarkupTest(unittest.TestCase):
+    def test_diff_returns_cells_and_markup_follows_on_read(self):
+        game_map = GameMap(80, 40, use_procedural=False, rng=random.Random(1))
+        renderer = game_map.renderer
+        for x in (12, 13, 14):
+            game_map.update_fov(x, 8)
+            changed = game_map.render_frame_diff(x, 8)
+            self.assertTrue(changed)
+            for y, cells in changed.items():
+                self.assertIs(cells, renderer.cells[y])
+        self.assertTrue(renderer._stale_lines)
+        self.assertEqual(renderer.lines, [cells_to_markup(cells) for cells in renderer.cells])
+        self.assertFalse(renderer._stale_lines)
+        self.assertEqual(game_map.render_with_entities(14, 8), '\n'.join(renderer.lines))
+
+
+if __name__ == "__main__":
+    unittest.main()
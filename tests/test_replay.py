@@ -0,0 +1,72 @@
+"""Action recordings replay to the same final state.
+
+    python -m unittest tests.test_replay
+"""
+
+import os
+import unittest
+
+from game.engine import Engine
+from game.replay import Recorder, read_recording, replay, state_hash
+from game.save import load_game, save_game
+from tests.support import TempDirTestCase, play
+
+
+class ReplayTest(TempDirTestCase):
+    filename = "dive.rec"
+    
+    def record(self, engine: Engine, turns: int, resumed: bool = False) -> bytes:
+        self.addCleanup(engine.close)
+        recorder = Recorder(engine, self.path, resumed)
+        play(engine, turns, 3)
+        recorder.close()
+        return state_hash(engine)
+    
+    def test_replay_reaches_the_recorded_state(self):
+        for algorithm in ('bsp', 'cave'):
+            with self.subTest(algorithm=algorithm):
+                final = self.record(Engine(pregenerate=False, seed=5, map_algorithm=algorithm),
+                                    800)
+                recording = read_recording(self.path)
+                self.assertEqual(len(recording.actions), 800)
+                result = replay(recording)
+                self.assertTrue(result.verified)
+                self.assertEqual(result.final_hash, final)
+    
+    def test_replays_are_deterministic(self):
+        self.record(Engine(pregenerate=False, seed=8), 500)
+        recording = read_recording(self.path)
+        self.assertEqual(replay(recording).final_hash, replay(recording).final_hash)
+    
+    def test_resumed_dive_replays_from_its_snapshot(self):
+        engine = Engine(pregenerate=False, seed=9, map_algorithm='cave')
+        self.addCleanup(engine.close)
+        play(engine, 300, 4)
+        save_path = os.path.join(self.directory.name, "dive.sav")
+        save_game(engine, save_path)
+        final = self.record(load_game(save_path, pregenerate=False), 300, resumed=True)
+        result = replay(read_recording(self.path))
+        self.assertTrue(result.verified)
+        self.assertEqual(result.final_hash, final)
+    
+    def test_changed_action_is_detected(self):
+        self.record(Engine(pregenerate=False, seed=5), 400)
+        recording = read_recording(self.path)
+        last = recording.actions[-1]
+        recording.actions[-1] = next(action for action in Engine.ACTIONS[:4] if action != last)
+        self.assertFalse(replay(recording).verified)
+    
+    def test_unclosed_recording_has_no_verdict(self):
+        engine = Engine(pregenerate=False, seed=5)
+        self.addCleanup(engine.close)
+        recorder = Recorder(engine, self.path)
+        play(engine, 50, 3)
+        recorder._file.flush()
+        recording = read_recording(self.path)
+        self.assertEqual(len(recording.actions), 50)
+        self.assertIsNone(replay(recording).verified)
+        recorder.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Save files: round-trips and rejection of bad input.
+
+    python -m unittest tests.test_save
+"""
+
+import unittest
+
+from game.engine import Engine
+from game.save import capture, encode, load_game, restore_snapshot, save_game, snapshot
+from tests.support import TempDirTestCase, play
+
+
+class SaveRoundTripTest(TempDirTestCase):
+    filename = "dive.sav"
+    
+    def dive(self, algorithm: str, turns: int) -> Engine:
+        engine = Engine(pregenerate=False, seed=11, map_algorithm=algorithm)
+        self.addCleanup(engine.close)
+        play(engine, turns, 1)
+        return engine
+    
+    def load(self) -> Engine:
+        engine = load_game(self.path, pregenerate=False)
+        self.addCleanup(engine.close)
+        return engine
+    
+    def test_loaded_dive_matches_the_saved_one(self):
+        for algorithm in ('bsp', 'cave'):
+            with self.subTest(algorithm=algorithm):
+                engine = self.dive(algorithm, 600)
+                save_game(engine, self.path)
+                loaded = self.load()
+                self.assertEqual(snapshot(loaded), snapshot(engine))
+                self.assertEqual((loaded.player.x, loaded.player.y),
+                                 (engine.player.x, engine.player.y))
+                self.assertEqual(len(loaded.monster_manager.store),
+                                 len(engine.monster_manager.store))
+    
+    def test_loaded_dive_plays_on_identically(self):
+        engine = self.dive('cave', 400)
+        save_game(engine, self.path)
+        loaded = self.load()
+        play(engine, 400, 2)
+        play(loaded, 400, 2)
+        self.assertEqual(snapshot(loaded), snapshot(engine))
+    
+    def test_snapshot_restores_without_a_file(self):
+        engine = self.dive('bsp', 200)
+        restored = restore_snapshot(snapshot(engine), pregenerate=False)
+        self.addCleanup(restored.close)
+        self.assertEqual(snapshot(restored), snapshot(engine))
+    
+    def test_capture_keeps_the_state_it_was_taken_in(self):
+        engine = self.dive('cave', 200)
+        expected = snapshot(engine)
+        state = capture(engine)
+        play(engine, 200, 2)
+        self.assertEqual(encode(state), expected)
+    
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as save_file:
+            save_file.write(b'not a save file at all')
+        with self.assertRaises(ValueError):
+            load_game(self.path)
+    
+    def test_rejects_truncated_saves(self):
+        save_game(self.dive('bsp', 10), self.path)
+        with open(self.path, 'rb') as save_file:
+            data = save_file.read()
+        with open(self.path, 'wb') as save_file:
+            save_file.write(data[:len(data) // 2])
+        with self.assertRaises(ValueError):
+            load_game(self.path)
+
+    
+    def test_rejects_corrupt_saves(self):
+        save_game(self.dive('bsp', 10), self.path)
+        with open(self.path, 'rb') as save_file:
+            data = bytearray(save_file.read())
+        data[-8:] = bytes(8)
+        with open(self.path, 'wb') as save_file:
+            save_file.write(data)
+        with self.assertRaises(ValueError):
+            load_game(self.path)
+    
+    def test_rejects_short_snapshots(self):
+        body = snapshot(self.dive('bsp', 10))
+        with self.assertRaises(ValueError):
+            restore_snapshot(body[:10])
+
+
+if __name__ == "__main__":
+    unittest.main()